@@ -0,0 +1,49 @@
+from logging.config import fileConfig
+from sqlalchemy import create_engine, pool
+from alembic import context
+from app.config import get_settings
+from app.database import Base
+import app.models  # noqa: F401  registers every table on Base.metadata
+
+config = context.config
+target_metadata = Base.metadata
+
+# The app passes its own connection (see app.database.init_db); only the CLI
+# configures logging, so running migrations at startup leaves app logging alone.
+connection = config.attributes.get("connection")
+if connection is None and config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=get_settings().DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    if connection is not None:
+        _run(connection)
+        return
+    engine = create_engine(get_settings().DATABASE_URL, poolclass=pool.NullPool)
+    with engine.connect() as conn:
+        _run(conn)
+
+
+def _run(conn) -> None:
+    # Batch mode lets ALTER-style operations work on SQLite
+    context.configure(connection=conn, target_metadata=target_metadata, render_as_batch=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,220 @@
+"""Baseline schema: every table as the app created it before migrations were introduced.
+
+Databases created by the old create_all() startup are stamped at this revision
+automatically (see app.database.init_db) instead of being re-created, so it
+must stay exactly that schema: embeddings as JSON text, no embedding_pending.
+Later revisions bring it up to date.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('role', sa.Enum('FOUNDER', 'TALENT', 'INVESTOR', name='userrole'), nullable=False),
+    sa.Column('avatar_url', sa.String(), nullable=True),
+    sa.Column('bio', sa.String(), nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('profile_completeness', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+
+    op.create_table('investor_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('investor_type', sa.String(), nullable=True),
+    sa.Column('investment_thesis', sa.Text(), nullable=True),
+    sa.Column('preferred_sectors', sa.JSON(), nullable=True),
+    sa.Column('preferred_stages', sa.JSON(), nullable=True),
+    sa.Column('check_size_min', sa.Float(), nullable=True),
+    sa.Column('check_size_max', sa.Float(), nullable=True),
+    sa.Column('check_size_currency', sa.String(), nullable=True),
+    sa.Column('portfolio_companies', sa.JSON(), nullable=True),
+    sa.Column('linkedin_url', sa.String(), nullable=True),
+    sa.Column('is_diaspora', sa.Integer(), nullable=True),
+    sa.Column('country', sa.String(), nullable=True),
+    sa.Column('embedding', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    with op.batch_alter_table('investor_profiles', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_investor_profiles_id'), ['id'], unique=False)
+
+    op.create_table('startups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('founder_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('tagline', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('industry', sa.String(), nullable=False),
+    sa.Column('stage', sa.String(), nullable=True),
+    sa.Column('funding_ask', sa.Float(), nullable=True),
+    sa.Column('funding_currency', sa.String(), nullable=True),
+    sa.Column('traction_summary', sa.Text(), nullable=True),
+    sa.Column('team_size', sa.Integer(), nullable=True),
+    sa.Column('website', sa.String(), nullable=True),
+    sa.Column('pitch_deck_url', sa.String(), nullable=True),
+    sa.Column('team_gaps', sa.JSON(), nullable=True),
+    sa.Column('embedding', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['founder_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('founder_id')
+    )
+    with op.batch_alter_table('startups', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_startups_id'), ['id'], unique=False)
+
+    op.create_table('talent_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('institution', sa.String(), nullable=True),
+    sa.Column('degree', sa.String(), nullable=True),
+    sa.Column('graduation_year', sa.Integer(), nullable=True),
+    sa.Column('engagement_preference', sa.String(), nullable=True),
+    sa.Column('expected_compensation_min', sa.Float(), nullable=True),
+    sa.Column('expected_compensation_max', sa.Float(), nullable=True),
+    sa.Column('compensation_currency', sa.String(), nullable=True),
+    sa.Column('portfolio_url', sa.String(), nullable=True),
+    sa.Column('github_url', sa.String(), nullable=True),
+    sa.Column('linkedin_url', sa.String(), nullable=True),
+    sa.Column('looking_for_cofounder', sa.Integer(), nullable=True),
+    sa.Column('embedding', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    with op.batch_alter_table('talent_profiles', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_talent_profiles_id'), ['id'], unique=False)
+
+    op.create_table('talent_requirements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('startup_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('required_skills', sa.JSON(), nullable=False),
+    sa.Column('nice_to_have_skills', sa.JSON(), nullable=True),
+    sa.Column('engagement_type', sa.String(), nullable=True),
+    sa.Column('compensation_min', sa.Float(), nullable=True),
+    sa.Column('compensation_max', sa.Float(), nullable=True),
+    sa.Column('compensation_currency', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Integer(), nullable=True),
+    sa.Column('embedding', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['startup_id'], ['startups.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('talent_requirements', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_talent_requirements_id'), ['id'], unique=False)
+
+    op.create_table('talent_skills',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('profile_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('proficiency', sa.String(), nullable=True),
+    sa.Column('years_experience', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['profile_id'], ['talent_profiles.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('talent_skills', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_talent_skills_id'), ['id'], unique=False)
+
+    op.create_table('matches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_user_id', sa.Integer(), nullable=False),
+    sa.Column('target_user_id', sa.Integer(), nullable=False),
+    sa.Column('match_type', sa.String(), nullable=False),
+    sa.Column('overall_score', sa.Float(), nullable=False),
+    sa.Column('skill_overlap_score', sa.Float(), nullable=True),
+    sa.Column('semantic_score', sa.Float(), nullable=True),
+    sa.Column('matched_skills', sa.JSON(), nullable=True),
+    sa.Column('missing_skills', sa.JSON(), nullable=True),
+    sa.Column('requirement_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['requirement_id'], ['talent_requirements.id'], ),
+    sa.ForeignKeyConstraint(['source_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['target_user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_matches_id'), ['id'], unique=False)
+
+    op.create_table('connection_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('from_user_id', sa.Integer(), nullable=False),
+    sa.Column('to_user_id', sa.Integer(), nullable=False),
+    sa.Column('match_id', sa.Integer(), nullable=True),
+    sa.Column('message', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['from_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ),
+    sa.ForeignKeyConstraint(['to_user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('connection_requests', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_connection_requests_id'), ['id'], unique=False)
+
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('connection_requests', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_connection_requests_id'))
+
+    op.drop_table('connection_requests')
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_matches_id'))
+
+    op.drop_table('matches')
+    with op.batch_alter_table('talent_skills', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_talent_skills_id'))
+
+    op.drop_table('talent_skills')
+    with op.batch_alter_table('talent_requirements', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_talent_requirements_id'))
+
+    op.drop_table('talent_requirements')
+    with op.batch_alter_table('talent_profiles', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_talent_profiles_id'))
+
+    op.drop_table('talent_profiles')
+    with op.batch_alter_table('startups', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_startups_id'))
+
+    op.drop_table('startups')
+    with op.batch_alter_table('investor_profiles', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_investor_profiles_id'))
+
+    op.drop_table('investor_profiles')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
@@ -0,0 +1,46 @@
+"""Indexes for the columns every hot path filters on.
+
+check_query_plans.py asserts that SQLite actually picks these up.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_matches_source_user_score', 'matches',
+        ['source_user_id', sa.text('overall_score DESC'), 'id'],
+    )
+    op.create_index(
+        'ix_connection_requests_from_to_status', 'connection_requests',
+        ['from_user_id', 'to_user_id', 'status'],
+    )
+    op.create_index('ix_connection_requests_to_user_id', 'connection_requests', ['to_user_id'])
+    op.create_index('ix_connection_requests_match_id', 'connection_requests', ['match_id'])
+    op.create_index('ix_talent_requirements_active', 'talent_requirements', ['is_active', 'id'])
+    op.create_index('ix_talent_requirements_startup_id', 'talent_requirements', ['startup_id'])
+    op.create_index('ix_talent_skills_profile_id', 'talent_skills', ['profile_id'])
+    op.create_index('ix_talent_skills_name', 'talent_skills', ['name'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_talent_skills_name', table_name='talent_skills')
+    op.drop_index('ix_talent_skills_profile_id', table_name='talent_skills')
+    op.drop_index('ix_talent_requirements_startup_id', table_name='talent_requirements')
+    op.drop_index('ix_talent_requirements_active', table_name='talent_requirements')
+    op.drop_index('ix_connection_requests_match_id', table_name='connection_requests')
+    op.drop_index('ix_connection_requests_to_user_id', table_name='connection_requests')
+    op.drop_index('ix_connection_requests_from_to_status', table_name='connection_requests')
+    op.drop_index('ix_matches_source_user_score', table_name='matches')
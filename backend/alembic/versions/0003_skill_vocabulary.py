@@ -0,0 +1,103 @@
+"""Canonical skill vocabulary and packed skill bitsets.
+
+Seeds the common skills and their aliases. The skill_bits columns start out
+NULL; load_skill_indexes() fills them in (interning any skill names it has
+not seen) the first time the app starts on the upgraded database.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Canonical name -> normalized aliases (lowercase, single spaces)
+SEED_SKILLS = {
+    'Python': ['python3', 'py'],
+    'JavaScript': ['js', 'es6', 'ecmascript'],
+    'TypeScript': ['ts'],
+    'React': ['reactjs', 'react.js', 'react js'],
+    'React Native': ['react-native'],
+    'Node.js': ['node', 'nodejs', 'node js'],
+    'Vue.js': ['vue', 'vuejs'],
+    'Next.js': ['nextjs', 'next'],
+    'Django': [],
+    'FastAPI': ['fast api'],
+    'Flask': [],
+    'SQL': [],
+    'PostgreSQL': ['postgres', 'psql', 'postgre sql'],
+    'MySQL': [],
+    'MongoDB': ['mongo'],
+    'REST API': ['rest', 'rest apis', 'restful api', 'restful apis'],
+    'GraphQL': [],
+    'Docker': [],
+    'Kubernetes': ['k8s'],
+    'AWS': ['amazon web services'],
+    'Go': ['golang'],
+    'Java': [],
+    'Kotlin': [],
+    'Swift': [],
+    'Flutter': [],
+    'Tailwind CSS': ['tailwind', 'tailwindcss'],
+    'Figma': [],
+    'Adobe XD': ['xd'],
+    'User Research': ['ux research'],
+    'Prototyping': [],
+    'UI/UX Design': ['ui/ux', 'ux design', 'ui design', 'ux/ui'],
+    'Data Science': [],
+    'Machine Learning': ['ml'],
+    'NLP': ['natural language processing'],
+    'TensorFlow': ['tf', 'tensor flow'],
+    'PyTorch': ['torch'],
+    'MLOps': ['ml ops'],
+}
+
+
+def upgrade() -> None:
+    skills = op.create_table(
+        'skills',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('normalized', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('normalized'),
+    )
+    aliases = op.create_table(
+        'skill_aliases',
+        sa.Column('alias', sa.String(), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['skill_id'], ['skills.id']),
+        sa.PrimaryKeyConstraint('alias'),
+    )
+    op.add_column('talent_profiles', sa.Column('skill_bits', sa.LargeBinary(), nullable=True))
+    op.add_column('talent_requirements', sa.Column('skill_bits', sa.LargeBinary(), nullable=True))
+
+    op.bulk_insert(skills, [
+        {'id': skill_id, 'name': name, 'normalized': name.lower()}
+        for skill_id, name in enumerate(SEED_SKILLS, start=1)
+    ])
+    op.bulk_insert(aliases, [
+        {'alias': alias, 'skill_id': skill_id}
+        for skill_id, names in enumerate(SEED_SKILLS.values(), start=1)
+        for alias in names
+    ])
+    if op.get_context().dialect.name == 'postgresql':
+        # The seed rows carry explicit ids, which do not advance the id sequence
+        op.execute("SELECT setval(pg_get_serial_sequence('skills', 'id'), (SELECT max(id) FROM skills))")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('talent_requirements') as batch_op:
+        batch_op.drop_column('skill_bits')
+    with op.batch_alter_table('talent_profiles') as batch_op:
+        batch_op.drop_column('skill_bits')
+    op.drop_table('skill_aliases')
+    op.drop_table('skills')
@@ -0,0 +1,83 @@
+"""Float32 embedding blobs and the embedding_pending flag.
+
+The baseline schema stored embeddings as JSON text. This converts every stored
+vector to the unit-length little-endian float32 blob that
+app.models.types.EmbeddingVector reads, and adds the embedding_pending flag
+used by background embedding. Tables that already have either (databases
+converted by the old migrate_embeddings.py script, or created while the
+baseline revision wrongly included them) are left as they are.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['talent_profiles', 'startups', 'talent_requirements', 'investor_profiles']
+BATCH_SIZE = 500
+
+
+def _to_blob(value):
+    # SQLite databases converted in place by migrate_embeddings.py already hold blobs
+    if value is None or isinstance(value, (bytes, memoryview)):
+        return value
+    if isinstance(value, str):
+        value = json.loads(value)
+    vec = np.asarray(value, dtype='<f4')
+    if vec.size == 0:
+        return None
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec = (vec / norm).astype('<f4')
+    return vec.tobytes()
+
+
+def _to_json(value):
+    if value is None:
+        return None
+    return json.dumps(np.frombuffer(value, dtype='<f4').tolist())
+
+
+def _rewrite(conn, table: str, column_type, convert) -> None:
+    """Swap the embedding column for one of column_type, converting each stored value."""
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.add_column(sa.Column('embedding_new', column_type, nullable=True))
+    rows = conn.execute(sa.text(f'SELECT id, embedding FROM {table} WHERE embedding IS NOT NULL')).all()
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(
+            sa.text(f'UPDATE {table} SET embedding_new = :value WHERE id = :id'),
+            [{'id': row_id, 'value': convert(value)} for row_id, value in rows[start:start + BATCH_SIZE]],
+        )
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.drop_column('embedding')
+        batch_op.alter_column('embedding_new', new_column_name='embedding')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    for table in TABLES:
+        columns = {c['name']: c['type'] for c in inspector.get_columns(table)}
+        if 'embedding_pending' not in columns:
+            op.add_column(table, sa.Column('embedding_pending', sa.Integer(), nullable=True))
+        if not isinstance(columns['embedding'], sa.LargeBinary):
+            _rewrite(conn, table, sa.LargeBinary(), _to_blob)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for table in TABLES:
+        _rewrite(conn, table, sa.JSON(), _to_json)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('embedding_pending')
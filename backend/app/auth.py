@@ -3,15 +3,20 @@ from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from app.config import get_settings
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.models.user import User
+from app.models.talent import TalentProfile
+from app.services.user_cache import user_cache
 
 settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+# bcrypt is deliberately slow CPU work; async routes call these through run_in_threadpool
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
@@ -28,10 +33,33 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-def get_current_user(
+async def _load_user(user_id: int) -> User | None:
+    """Load a detached snapshot of a user that can be cached and merged into any session.
+
+    Async sessions cannot lazy-load, so the role profile (and a talent's skills)
+    always comes with the user: in the same query with AUTH_EAGER_PROFILE, or in
+    small follow-up queries without it.
+    """
+    # A user has at most one of these, so the outer joins add no rows
+    load = joinedload if settings.AUTH_EAGER_PROFILE else selectinload
+    query = select(User).where(User.id == user_id).options(
+        load(User.startup),
+        load(User.talent_profile).options(load(TalentProfile.skills)),
+        load(User.investor_profile),
+    )
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(query)).unique().scalars().first()
+
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> User:
+    cached = user_cache.get(token)
+    if cached is not None:
+        # merge(load=False) copies the snapshot into this session without any SQL
+        return await db.merge(cached, load=False)
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid authentication credentials",
@@ -49,7 +77,8 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await _load_user(user_id)
     if user is None:
         raise credentials_exception
-    return user
+    user_cache.put(token, user, payload.get("exp", 0))
+    return await db.merge(user, load=False)
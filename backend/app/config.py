@@ -8,10 +8,45 @@ class Settings(BaseSettings):
     # read-only/ephemeral (Vercel, AWS Lambda, etc.). When running in those
     # environments we automatically fall back to an in-memory SQLite database.
     DATABASE_URL: str = "sqlite:///./neplaunch.db"
+    ASYNC_DATABASE_URL: str = ""  # derived from DATABASE_URL when empty (sqlite+aiosqlite, postgresql+asyncpg, ...)
+    # Connection pool (server databases such as Postgres)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds; stay under server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True
+    # SQLite pragmas applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "wal"  # readers no longer block on a writer
+    SQLITE_SYNCHRONOUS: str = "normal"  # safe with WAL; fsync only at checkpoints
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    SLOW_QUERY_MS: float = 250.0  # statements slower than this are logged with their route; 0 disables
+    DEBUG: bool = False  # adds X-DB-Queries / X-DB-Time headers to every response
     SECRET_KEY: str = "dev-secret-key-change-in-production"
     OPENAI_API_KEY: str = ""
+    OPENAI_BASE_URL: str = ""  # empty for the real API; e.g. http://127.0.0.1:8100/v1 for fake_upstream.py
+    # Upstream calls (app/services/llm_gateway.py)
+    LLM_TIMEOUT_SECONDS: float = 30.0  # per attempt
+    EMBEDDING_TIMEOUT_SECONDS: float = 10.0
+    UPSTREAM_MAX_CONCURRENCY: int = 8  # in-flight calls per gateway (chat, embeddings)
+    UPSTREAM_MAX_RETRIES: int = 2
+    UPSTREAM_RETRY_BASE_DELAY: float = 0.5  # seconds; doubled per retry, with full jitter
+    UPSTREAM_BREAKER_THRESHOLD: int = 5  # consecutive failures that open the circuit
+    UPSTREAM_BREAKER_COOLDOWN_SECONDS: float = 30.0
+    EMBEDDING_PROVIDER: str = "openai"  # openai, hashing (local, offline)
+    EMBEDDING_DIM: int = 512  # vector size for the hashing provider
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     ALGORITHM: str = "HS256"
+    EMBEDDING_CACHE_PATH: str = "./embedding_cache.db"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 50000
+    EMBEDDING_WORKERS: int = 4
+    LLM_CACHE_PATH: str = "./llm_cache.db"
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    AUTH_CACHE_TTL_SECONDS: int = 60  # 0 disables the token -> user cache
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_EAGER_PROFILE: bool = True  # load the user's startup/talent/investor profile with the user
 
     class Config:
         env_file = ".env"
@@ -22,8 +57,13 @@ class Settings(BaseSettings):
         if self.DATABASE_URL.startswith("sqlite://"):
             # vercel sets VERCEL=1, lambda sets AWS_LAMBDA_FUNCTION_NAME
             if os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
-                # use memory DB to avoid "unable to open database file" errors
-                self.DATABASE_URL = "sqlite:///:memory:"
+                # use memory DB to avoid "unable to open database file" errors; shared-cache so the
+                # sync and async engines (and every thread) see the same database
+                self.DATABASE_URL = "sqlite:///file:neplaunch?mode=memory&cache=shared&uri=true"
+        if os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+            # the embedding and LLM cache files have the same problem
+            self.EMBEDDING_CACHE_PATH = ":memory:"
+            self.LLM_CACHE_PATH = ":memory:"
 
 
 @lru_cache()
@@ -1,20 +1,161 @@
-from sqlalchemy import create_engine
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-)
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def engine_options(url: str) -> dict:
+    """create_engine keyword arguments for a database URL, taken from the settings."""
+    if is_sqlite(url):
+        # SQLite pools are picked by SQLAlchemy (file vs memory); pool sizing does not apply
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_pragmas() -> dict[str, object]:
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,  # negative means KiB rather than pages
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+    }
+
+
+def apply_sqlite_pragmas(engine, pragmas: dict[str, object]) -> None:
+    """Run the pragmas on every new DBAPI connection of a (sync) engine."""
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+class QueryStats:
+    """Statements executed, and the time spent in them, within one track_queries() block."""
+
+    __slots__ = ("count", "seconds", "route")
+
+    def __init__(self, route: str | None = None):
+        self.count = 0
+        self.seconds = 0.0
+        self.route = route
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries(route: str | None = None):
+    """Count the statements run in this context, on either engine.
+
+    Covers work the context hands to run_in_threadpool, which copies the
+    context, but not the embedding workers. Handy for asserting query bounds::
+
+        with track_queries() as stats:
+            run_matching_for_user(db, user)
+        assert stats.count <= 10
+    """
+    stats = QueryStats(route)
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def instrument_engine(engine) -> None:
+    """Feed a (sync) engine's statements into track_queries() and the slow-query log."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+        if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            route = stats.route if stats is not None and stats.route else "background"
+            logger.warning("Slow query (%.1f ms) in %s: %s", elapsed * 1000, route, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(exception_context):
+        started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+        if started:
+            started.pop()
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async drivers for the request path; scripts, migrations and worker threads keep the sync engine
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "mysql": "mysql+aiomysql"}
 
-def get_db():
-    db = SessionLocal()
-    try:
+
+def async_database_url(url: str) -> str:
+    """The async-driver form of a sync database URL, e.g. sqlite:// -> sqlite+aiosqlite://."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False) if driver else url
+
+
+ASYNC_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_URL, **engine_options(ASYNC_URL))
+if is_sqlite(settings.DATABASE_URL):
+    apply_sqlite_pragmas(engine, sqlite_pragmas())
+if is_sqlite(ASYNC_URL):
+    apply_sqlite_pragmas(async_engine.sync_engine, sqlite_pragmas())
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+# Objects stay usable after commit; async sessions cannot lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+BASELINE_REVISION = "0001"
+
+
+def init_db():
+    """Bring the schema up to the latest Alembic revision.
+
+    Databases created before migrations existed have tables but no version
+    row, so they are stamped at the baseline rather than created again.
+    """
+    config = Config(str(ALEMBIC_INI))
+    with engine.begin() as conn:
+        # Reuse the app's connection; an in-memory SQLite database only exists on it
+        config.attributes["connection"] = conn
+        tables = inspect(conn).get_table_names()
+        if "users" in tables and "alembic_version" not in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,15 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.routes import auth, startups, talent, investors, matching
+from app.database import SessionLocal, init_db
+from app.routes import auth, startups, talent, investors, matching, metrics
+from app.metrics import DB_QUERIES_HEADER, DB_TIME_HEADER, MetricsMiddleware
+from app.services.vector_index import load_indexes
+from app.services.skill_index import load_skill_indexes
+from app.services.embedding_queue import embedding_queue, enqueue_pending
+from app.pagination import NEXT_CURSOR_HEADER
+
+# Create or upgrade the schema
+init_db()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the in-memory embedding and skill indexes once; write handlers keep them current
+    db = SessionLocal()
+    try:
+        load_indexes(db)
+        load_skill_indexes(db)
+        # Rows left pending by the last process (or a failed provider call) would never be retried
+        enqueue_pending(db)
+    finally:
+        db.close()
+    yield
+    # Let in-flight embedding jobs persist before the process exits
+    embedding_queue.shutdown()
 
-# Create tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="NepLaunch API",
     description="Three-sided intelligent platform connecting Nepal's founders, investors, and talent",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -18,13 +42,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, DB_QUERIES_HEADER, DB_TIME_HEADER],
 )
+# Outermost, so the recorded latency covers every other middleware
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router)
 app.include_router(startups.router)
 app.include_router(talent.router)
 app.include_router(investors.router)
 app.include_router(matching.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -3,3 +3,4 @@ from app.models.startup import Startup, TalentRequirement
 from app.models.talent import TalentProfile, TalentSkill
 from app.models.investor import InvestorProfile
 from app.models.matching import Match, ConnectionRequest
+from app.models.skill import Skill, SkillAlias
@@ -1,7 +1,8 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime, timezone
 from app.database import Base
+from app.models.types import EmbeddingVector
 
 
 class InvestorProfile(Base):
@@ -20,7 +21,8 @@ class InvestorProfile(Base):
     linkedin_url = Column(String, nullable=True)
     is_diaspora = Column(Integer, default=0)
     country = Column(String, default="Nepal")
-    embedding = Column(JSON, nullable=True)
+    embedding = deferred(Column(EmbeddingVector, nullable=True))
+    embedding_pending = Column(Integer, default=0)  # set while the embedding is being recomputed
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
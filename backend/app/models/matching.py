@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, JSON, Index
 from datetime import datetime, timezone
 from app.database import Base
 
@@ -18,6 +18,11 @@ class Match(Base):
     requirement_id = Column(Integer, ForeignKey("talent_requirements.id"), nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        # Serves a user's results best-first, including the keyset tie-break on id
+        Index("ix_matches_source_user_score", source_user_id, overall_score.desc(), id),
+    )
+
 
 class ConnectionRequest(Base):
     __tablename__ = "connection_requests"
@@ -30,3 +35,10 @@ class ConnectionRequest(Base):
     status = Column(String, default="pending")  # pending, accepted, declined
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        # The pending-request check, and the sender half of the connections list
+        Index("ix_connection_requests_from_to_status", from_user_id, to_user_id, status),
+        Index("ix_connection_requests_to_user_id", to_user_id),
+        Index("ix_connection_requests_match_id", match_id),
+    )
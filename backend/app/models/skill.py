@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.database import Base
+
+
+class Skill(Base):
+    """Canonical skill. Its ID is the skill's bit position in packed skill bitsets."""
+
+    __tablename__ = "skills"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)  # display form, e.g. "React"
+    normalized = Column(String, unique=True, nullable=False)  # lookup key, e.g. "react"
+
+
+class SkillAlias(Base):
+    """Alternative spelling folded into a canonical skill, e.g. "reactjs" -> React."""
+
+    __tablename__ = "skill_aliases"
+
+    alias = Column(String, primary_key=True)  # normalized
+    skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False)
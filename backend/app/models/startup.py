@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, JSON, Index
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime, timezone
 from app.database import Base
+from app.models.types import EmbeddingVector, SkillBits
 
 
 class Startup(Base):
@@ -21,7 +22,8 @@ class Startup(Base):
     website = Column(String, nullable=True)
     pitch_deck_url = Column(String, nullable=True)
     team_gaps = Column(JSON, nullable=True)  # AI-generated team gap analysis
-    embedding = Column(JSON, nullable=True)  # Stored OpenAI embedding
+    embedding = deferred(Column(EmbeddingVector, nullable=True))  # Unit-length float32 blob, loaded on access
+    embedding_pending = Column(Integer, default=0)  # set while the embedding is being recomputed
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
@@ -43,7 +45,14 @@ class TalentRequirement(Base):
     compensation_max = Column(Float, nullable=True)
     compensation_currency = Column(String, default="NPR")
     is_active = Column(Integer, default=1)
-    embedding = Column(JSON, nullable=True)
+    embedding = deferred(Column(EmbeddingVector, nullable=True))
+    embedding_pending = Column(Integer, default=0)  # set while the embedding is being recomputed
+    skill_bits = deferred(Column(SkillBits, nullable=True))  # bitset of required_skills; NULL until first computed
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     startup = relationship("Startup", back_populates="requirements")
+
+    __table_args__ = (
+        Index("ix_talent_requirements_active", is_active, id),
+        Index("ix_talent_requirements_startup_id", startup_id),
+    )
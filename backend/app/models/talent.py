@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, Index
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime, timezone
 from app.database import Base
+from app.models.types import EmbeddingVector, SkillBits
 
 
 class TalentProfile(Base):
@@ -20,7 +21,9 @@ class TalentProfile(Base):
     github_url = Column(String, nullable=True)
     linkedin_url = Column(String, nullable=True)
     looking_for_cofounder = Column(Integer, default=0)
-    embedding = Column(JSON, nullable=True)
+    embedding = deferred(Column(EmbeddingVector, nullable=True))
+    embedding_pending = Column(Integer, default=0)  # set while the embedding is being recomputed
+    skill_bits = deferred(Column(SkillBits, nullable=True))  # bitset of the skills rows; NULL until first computed
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
@@ -38,3 +41,8 @@ class TalentSkill(Base):
     years_experience = Column(Float, default=0)
 
     profile = relationship("TalentProfile", back_populates="skills")
+
+    __table_args__ = (
+        Index("ix_talent_skills_profile_id", profile_id),
+        Index("ix_talent_skills_name", name),
+    )
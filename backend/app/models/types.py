@@ -0,0 +1,81 @@
+import numpy as np
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+EMBEDDING_DTYPE = np.dtype("<f4")
+SKILL_BITS_DTYPE = np.dtype("<u8")
+
+
+def pack_embedding(embedding) -> bytes | None:
+    """Serialize an embedding as a unit-length little-endian float32 blob."""
+    if embedding is None:
+        return None
+    vec = np.asarray(embedding, dtype=EMBEDDING_DTYPE)
+    if vec.size == 0:
+        return None
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec = (vec / norm).astype(EMBEDDING_DTYPE)
+    return vec.tobytes()
+
+
+def unpack_embedding(blob: bytes | None) -> np.ndarray | None:
+    """Zero-copy, read-only float32 view over a stored embedding blob."""
+    if blob is None:
+        return None
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE)
+
+
+class EmbeddingVector(TypeDecorator):
+    """Embedding stored as a pre-normalized float32 blob (~6 KB for 1536 dims).
+
+    Accepts lists or arrays on write and returns np.frombuffer views on read.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return pack_embedding(value)
+
+    def process_result_value(self, value, dialect):
+        return unpack_embedding(value)
+
+    def compare_values(self, x, y):
+        if x is None or y is None:
+            return x is y
+        return np.array_equal(np.asarray(x, dtype=EMBEDDING_DTYPE), np.asarray(y, dtype=EMBEDDING_DTYPE))
+
+
+def pack_skill_bits(bits) -> bytes | None:
+    """Serialize a skill bitset as little-endian uint64 words, without trailing zero words."""
+    if bits is None:
+        return None
+    return np.trim_zeros(np.asarray(bits, dtype=SKILL_BITS_DTYPE), "b").tobytes()
+
+
+def unpack_skill_bits(blob: bytes | None) -> np.ndarray | None:
+    if blob is None:
+        return None
+    return np.frombuffer(blob, dtype=SKILL_BITS_DTYPE)
+
+
+class SkillBits(TypeDecorator):
+    """Packed bitset of skill IDs (see app/services/skill_vocabulary.py); bit i set means skill i.
+
+    NULL means the bitset has not been computed yet; an empty blob means no skills.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return pack_skill_bits(value)
+
+    def process_result_value(self, value, dialect):
+        return unpack_skill_bits(value)
+
+    def compare_values(self, x, y):
+        # The old value may also be an unloaded-attribute marker (the column is deferred)
+        if not isinstance(x, np.ndarray) or not isinstance(y, np.ndarray):
+            return x is y
+        return pack_skill_bits(x) == pack_skill_bits(y)
@@ -0,0 +1,79 @@
+"""Keyset pagination and field projection shared by the list endpoints.
+
+List endpoints keep returning a plain JSON array. When more rows exist, the
+opaque cursor for the next page is sent in the ``X-Next-Cursor`` header; pass it
+back as ``?cursor=`` to continue. ``?fields=a,b`` limits both the selected
+columns and the returned keys.
+"""
+import base64
+import json
+from fastapi import HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """Query parameters every paginated list endpoint accepts."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str | None = Query(None, description="Value of X-Next-Cursor from the previous page"),
+        fields: str | None = Query(None, description="Comma-separated fields to return"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+
+
+def encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def parse_fields(fields: str | None, allowed) -> list[str] | None:
+    """Requested field names in order, or None when no projection was asked for."""
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def projection_columns(model, fields: list[str], *required: str) -> list:
+    """Model columns to select for a projection, plus any the cursor needs."""
+    return [getattr(model, f) for f in dict.fromkeys([*required, *fields])]
+
+
+async def fetch_page(db, stmt, limit: int, cursor_of, entities: bool = True) -> tuple[list, str | None]:
+    """Run an ordered select for one page. Returns (rows, next cursor or None).
+
+    With ``entities`` the select is of one mapped class and model instances are
+    returned; otherwise (projections) the result rows are.
+    """
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = result.scalars().all() if entities else result.all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*cursor_of(rows[-1]))
+
+
+def projected_response(items: list[dict], next_cursor: str | None) -> JSONResponse:
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return JSONResponse(content=jsonable_encoder(items), headers=headers)
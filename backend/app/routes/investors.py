@@ -1,20 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.auth import get_current_user
 from app.models.user import User, UserRole
 from app.models.investor import InvestorProfile
 from app.schemas.investor import InvestorProfileCreate, InvestorProfileResponse
-from app.services.embeddings import get_embedding, build_investor_text
+from app.services.embeddings import build_investor_text
+from app.services.embedding_queue import embedding_queue
+from app.services.user_cache import user_cache
 
 router = APIRouter(prefix="/api/investors", tags=["investors"])
 
 
 @router.post("", response_model=InvestorProfileResponse)
-def create_investor_profile(
+async def create_investor_profile(
     data: InvestorProfileCreate,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     if user.role != UserRole.INVESTOR:
         raise HTTPException(status_code=403, detail="Only investors can create investor profiles")
@@ -25,26 +27,28 @@ def create_investor_profile(
         user_id=user.id,
         **data.model_dump(exclude={"is_diaspora"}),
         is_diaspora=1 if data.is_diaspora else 0,
+        embedding_pending=1,
     )
-    profile.embedding = get_embedding(build_investor_text(profile))
     db.add(profile)
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
+    user_cache.invalidate(user.id)
+    embedding_queue.enqueue("investor", profile.id, build_investor_text(profile))
     return InvestorProfileResponse.model_validate(profile)
 
 
 @router.get("/me", response_model=InvestorProfileResponse)
-def get_my_profile(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_my_profile(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     if not user.investor_profile:
         raise HTTPException(status_code=404, detail="No investor profile found")
     return InvestorProfileResponse.model_validate(user.investor_profile)
 
 
 @router.put("/me", response_model=InvestorProfileResponse)
-def update_investor_profile(
+async def update_investor_profile(
     data: InvestorProfileCreate,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     profile = user.investor_profile
     if not profile:
@@ -53,7 +57,9 @@ def update_investor_profile(
     for key, val in data.model_dump(exclude={"is_diaspora"}).items():
         setattr(profile, key, val)
     profile.is_diaspora = 1 if data.is_diaspora else 0
-    profile.embedding = get_embedding(build_investor_text(profile))
-    db.commit()
-    db.refresh(profile)
+    profile.embedding_pending = 1
+    await db.commit()
+    await db.refresh(profile)
+    user_cache.invalidate(user.id)
+    embedding_queue.enqueue("investor", profile.id, build_investor_text(profile))
     return InvestorProfileResponse.model_validate(profile)
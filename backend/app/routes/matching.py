@@ -1,43 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+import json
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import SessionLocal, get_db
 from app.auth import get_current_user
+from app.metrics import span
 from app.models.user import User
 from app.models.matching import Match, ConnectionRequest
+from app.models.startup import Startup
 from app.schemas.matching import (
     MatchResponse, ConnectionRequestCreate, ConnectionRequestResponse,
     PitchFeedbackRequest, PitchFeedbackResponse,
 )
 from app.services.matching_engine import run_matching_for_user
-from app.services.ai_copilot import analyze_pitch, analyze_team_gaps
+from app.services.ai_copilot import (
+    analyze_pitch, fetch_team_gaps, mock_team_gaps, stream_pitch_feedback, team_gaps_input,
+)
+from app.services.user_cache import user_cache
+from app.pagination import (
+    PageParams, NEXT_CURSOR_HEADER, decode_cursor, fetch_page, parse_fields, projection_columns,
+    projected_response,
+)
 
 router = APIRouter(prefix="/api/matching", tags=["matching"])
+logger = logging.getLogger(__name__)
 
 
 @router.post("/refresh", response_model=list[MatchResponse])
-def refresh_matches(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def refresh_matches(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     """Re-compute all matches for the current user."""
-    matches = run_matching_for_user(db, user)
-    return _enrich_matches(matches, db)
+    # Scoring is CPU-bound and the engine uses the sync ORM, so it runs on a worker thread
+    matches = await run_in_threadpool(_refresh_in_thread, user.id)
+    with span("matching.enrich"):
+        return await _enrich_matches(matches, db)
+
+
+def _refresh_in_thread(user_id: int) -> list[Match]:
+    with SessionLocal() as session:
+        return run_matching_for_user(session, session.get(User, user_id))
 
 
 @router.get("/results", response_model=list[MatchResponse])
-def get_matches(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Get cached matches for the current user."""
-    matches = db.query(Match).filter(Match.source_user_id == user.id).order_by(Match.overall_score.desc()).all()
-    return _enrich_matches(matches, db)
+async def get_matches(
+    response: Response,
+    page: PageParams = Depends(),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get cached matches for the current user, best first."""
+    fields = parse_fields(page.fields, MatchResponse.model_fields)
+    enrich = fields is None or any(f in ENRICHED_MATCH_FIELDS for f in fields)
+    if fields is None:
+        query = select(Match)
+    else:
+        required = ["id", "overall_score"] + (["target_user_id"] if enrich else [])
+        columns = [f for f in fields if f not in ENRICHED_MATCH_FIELDS]
+        query = select(*projection_columns(Match, columns, *required))
+    query = query.where(Match.source_user_id == user.id)
+    if page.cursor:
+        last_score, last_id = decode_cursor(page.cursor, 2)
+        query = query.where(or_(
+            Match.overall_score < last_score,
+            and_(Match.overall_score == last_score, Match.id > last_id),
+        ))
+    rows, next_cursor = await fetch_page(
+        db, query.order_by(Match.overall_score.desc(), Match.id), page.limit, lambda r: (r.overall_score, r.id),
+        entities=fields is None,
+    )
+
+    if fields is not None:
+        targets = await _match_targets({r.target_user_id for r in rows}, db) if enrich else {}
+        items = []
+        for r in rows:
+            enriched = targets.get(r.target_user_id, {}) if enrich else {}
+            items.append({f: enriched.get(f) if f in ENRICHED_MATCH_FIELDS else getattr(r, f) for f in fields})
+        return projected_response(items, next_cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return await _enrich_matches(rows, db)
+
 
+ENRICHED_MATCH_FIELDS = {"target_name", "target_role", "startup_name"}
 
-def _enrich_matches(matches: list[Match], db: Session) -> list[MatchResponse]:
+
+async def _match_targets(target_ids: set[int], db: AsyncSession) -> dict[int, dict]:
+    """Enriched fields per target user, from one query however many matches there are."""
+    if not target_ids:
+        return {}
+    rows = await db.execute(
+        select(User.id, User.full_name, User.role, Startup.name)
+        .outerjoin(Startup, Startup.founder_id == User.id)
+        .where(User.id.in_(target_ids))
+    )
+    return {
+        user_id: {
+            "target_name": full_name,
+            "target_role": role.value if role else None,
+            "startup_name": startup_name,
+        }
+        for user_id, full_name, role, startup_name in rows
+    }
+
+
+async def _enrich_matches(matches: list[Match], db: AsyncSession) -> list[MatchResponse]:
+    targets = await _match_targets({m.target_user_id for m in matches}, db)
     results = []
     for m in matches:
-        target = db.query(User).filter(User.id == m.target_user_id).first()
         resp = MatchResponse.model_validate(m)
-        if target:
-            resp.target_name = target.full_name
-            resp.target_role = target.role.value if target.role else None
-            if target.startup:
-                resp.startup_name = target.startup.name
+        for key, value in targets.get(m.target_user_id, {}).items():
+            setattr(resp, key, value)
         results.append(resp)
     return results
 
@@ -45,80 +119,160 @@ def _enrich_matches(matches: list[Match], db: Session) -> list[MatchResponse]:
 # --- Connection Requests ---
 
 @router.post("/connect", response_model=ConnectionRequestResponse)
-def send_connection(
+async def send_connection(
     data: ConnectionRequestCreate,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    existing = db.query(ConnectionRequest).filter(
+    existing = await db.scalar(select(ConnectionRequest.id).where(
         ConnectionRequest.from_user_id == user.id,
         ConnectionRequest.to_user_id == data.to_user_id,
         ConnectionRequest.status == "pending",
-    ).first()
+    ).limit(1))
     if existing:
         raise HTTPException(status_code=400, detail="Connection request already pending")
 
     conn = ConnectionRequest(from_user_id=user.id, **data.model_dump())
     db.add(conn)
-    db.commit()
-    db.refresh(conn)
-    return _enrich_connection(conn, db)
+    await db.commit()
+    await db.refresh(conn)
+    return (await _enrich_connections([conn], db))[0]
 
 
 @router.get("/connections", response_model=list[ConnectionRequestResponse])
-def get_connections(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    conns = db.query(ConnectionRequest).filter(
+async def get_connections(
+    response: Response,
+    page: PageParams = Depends(),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    fields = parse_fields(page.fields, ConnectionRequestResponse.model_fields)
+    names_needed = fields is None or any(f in ENRICHED_CONNECTION_FIELDS for f in fields)
+    if fields is None:
+        query = select(ConnectionRequest)
+    else:
+        required = ["id"] + (["from_user_id", "to_user_id"] if names_needed else [])
+        columns = [f for f in fields if f not in ENRICHED_CONNECTION_FIELDS]
+        query = select(*projection_columns(ConnectionRequest, columns, *required))
+    query = query.where(
         (ConnectionRequest.from_user_id == user.id) | (ConnectionRequest.to_user_id == user.id)
-    ).all()
-    return [_enrich_connection(c, db) for c in conns]
+    )
+    if page.cursor:
+        (last_id,) = decode_cursor(page.cursor, 1)
+        query = query.where(ConnectionRequest.id > last_id)
+    rows, next_cursor = await fetch_page(
+        db, query.order_by(ConnectionRequest.id), page.limit, lambda r: (r.id,), entities=fields is None,
+    )
+
+    if fields is not None:
+        names = await _user_names({r.from_user_id for r in rows} | {r.to_user_id for r in rows}, db) if names_needed else {}
+        items = []
+        for r in rows:
+            enriched = {"from_name": names.get(r.from_user_id), "to_name": names.get(r.to_user_id)} if names_needed else {}
+            items.append({f: enriched.get(f) if f in ENRICHED_CONNECTION_FIELDS else getattr(r, f) for f in fields})
+        return projected_response(items, next_cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return await _enrich_connections(rows, db)
 
 
 @router.put("/connections/{conn_id}/accept")
-def accept_connection(conn_id: int, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    conn = db.query(ConnectionRequest).filter(ConnectionRequest.id == conn_id, ConnectionRequest.to_user_id == user.id).first()
+async def accept_connection(conn_id: int, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    conn = await db.scalar(
+        select(ConnectionRequest).where(ConnectionRequest.id == conn_id, ConnectionRequest.to_user_id == user.id)
+    )
     if not conn:
         raise HTTPException(status_code=404, detail="Connection request not found")
     conn.status = "accepted"
-    db.commit()
+    await db.commit()
     return {"status": "accepted"}
 
 
 @router.put("/connections/{conn_id}/decline")
-def decline_connection(conn_id: int, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    conn = db.query(ConnectionRequest).filter(ConnectionRequest.id == conn_id, ConnectionRequest.to_user_id == user.id).first()
+async def decline_connection(conn_id: int, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    conn = await db.scalar(
+        select(ConnectionRequest).where(ConnectionRequest.id == conn_id, ConnectionRequest.to_user_id == user.id)
+    )
     if not conn:
         raise HTTPException(status_code=404, detail="Connection request not found")
     conn.status = "declined"
-    db.commit()
+    await db.commit()
     return {"status": "declined"}
 
 
-def _enrich_connection(conn: ConnectionRequest, db: Session) -> ConnectionRequestResponse:
-    resp = ConnectionRequestResponse.model_validate(conn)
-    from_user = db.query(User).filter(User.id == conn.from_user_id).first()
-    to_user = db.query(User).filter(User.id == conn.to_user_id).first()
-    resp.from_name = from_user.full_name if from_user else None
-    resp.to_name = to_user.full_name if to_user else None
-    return resp
+ENRICHED_CONNECTION_FIELDS = {"from_name", "to_name"}
+
+
+async def _user_names(user_ids: set[int], db: AsyncSession) -> dict[int, str]:
+    if not user_ids:
+        return {}
+    return dict((await db.execute(select(User.id, User.full_name).where(User.id.in_(user_ids)))).all())
+
+
+async def _enrich_connections(conns: list[ConnectionRequest], db: AsyncSession) -> list[ConnectionRequestResponse]:
+    # One query for the names on both ends of every request
+    names = await _user_names({c.from_user_id for c in conns} | {c.to_user_id for c in conns}, db)
+    results = []
+    for conn in conns:
+        resp = ConnectionRequestResponse.model_validate(conn)
+        resp.from_name = names.get(conn.from_user_id)
+        resp.to_name = names.get(conn.to_user_id)
+        results.append(resp)
+    return results
 
 
 # --- AI Co-Pilot ---
 
 @router.post("/pitch-feedback", response_model=PitchFeedbackResponse)
-def get_pitch_feedback(data: PitchFeedbackRequest, user: User = Depends(get_current_user)):
-    result = analyze_pitch(data.pitch_text)
+async def get_pitch_feedback(data: PitchFeedbackRequest, user: User = Depends(get_current_user)):
+    result = await analyze_pitch(data.pitch_text)
     return PitchFeedbackResponse(**result)
 
 
+@router.post("/pitch-feedback/stream")
+async def stream_pitch_feedback_events(data: PitchFeedbackRequest, user: User = Depends(get_current_user)):
+    """Pitch feedback as Server-Sent Events.
+
+    `delta` events carry the model's JSON text as it is generated ({"text": ...});
+    a final `result` event carries the same body as /pitch-feedback. If generation
+    fails midway, an `error` event ends the stream.
+    """
+    async def events():
+        try:
+            async for event, payload in stream_pitch_feedback(data.pitch_text):
+                if event == "delta":
+                    payload = {"text": payload}
+                else:
+                    payload = PitchFeedbackResponse(**payload).model_dump()
+                yield _sse(event, payload)
+        except Exception:
+            # The 200 and headers are already sent, so report the failure in-band
+            logger.exception("Streaming pitch feedback failed")
+            yield _sse("error", {"detail": "Pitch feedback failed"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
 @router.get("/team-gaps")
-def get_team_gaps(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    if not user.startup:
+async def get_team_gaps(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    startup = user.startup
+    if not startup:
         raise HTTPException(status_code=400, detail="No startup profile found")
-    startup_data = {
-        "name": user.startup.name,
-        "industry": user.startup.industry,
-        "stage": user.startup.stage,
-        "team_size": user.startup.team_size,
-        "description": user.startup.description,
-    }
-    return analyze_team_gaps(startup_data)
+    # Stored until a field the analysis depends on changes (update_startup clears it)
+    if startup.team_gaps:
+        return startup.team_gaps
+    gaps = await fetch_team_gaps(team_gaps_input(startup))
+    if gaps is None:
+        return mock_team_gaps()  # not stored, so the real analysis runs once the model is available
+    startup.team_gaps = gaps
+    await db.commit()
+    user_cache.invalidate(user.id)
+    return gaps
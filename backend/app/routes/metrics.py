@@ -0,0 +1,64 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.metrics import MetricsMiddleware, format_labels, request_latency, request_queries, span_latency
+from app.services.embedding_cache import embedding_cache
+from app.services.embedding_queue import embedding_queue
+from app.services.llm_cache import llm_cache
+from app.services.llm_gateway import chat_gateway, embedding_gateway
+from app.services.user_cache import user_cache
+from app.services.vector_index import index_stats
+
+router = APIRouter(prefix="/api", tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _family(name: str, kind: str, help: str, label: str, samples: dict) -> list[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for value, sample in samples.items():
+        labels = format_labels((label,), (value,)) if label else ""
+        lines.append(f"{name}{labels} {float(sample)}")
+    return lines
+
+
+def _service_metrics() -> list[str]:
+    caches = {"user": user_cache.stats(), "llm": llm_cache.stats(), "embedding": embedding_cache.stats()}
+    indexes = index_stats()
+    gateways = {g.name: g.stats() for g in (chat_gateway, embedding_gateway)}
+    families = [
+        ("neplaunch_http_requests_in_progress", "gauge", "Requests being handled.", None,
+         {None: MetricsMiddleware.in_progress}),
+        ("neplaunch_cache_entries", "gauge", "Entries held by each cache.", "cache",
+         {name: s["size"] for name, s in caches.items()}),
+        ("neplaunch_cache_hits_total", "counter", "Cache lookups answered from the cache.", "cache",
+         {name: s["hits"] for name, s in caches.items()}),
+        ("neplaunch_cache_misses_total", "counter", "Cache lookups that missed.", "cache",
+         {name: s["misses"] for name, s in caches.items()}),
+        ("neplaunch_vector_index_entries", "gauge", "Embeddings held by each vector index.", "index",
+         {name: s["size"] for name, s in indexes.items()}),
+        ("neplaunch_vector_index_bytes", "gauge", "Memory used by each vector index.", "index",
+         {name: s["memory_bytes"] for name, s in indexes.items()}),
+        ("neplaunch_embedding_queue_pending", "gauge", "Rows waiting for a background embedding.", None,
+         {None: embedding_queue.pending()}),
+        ("neplaunch_upstream_calls_total", "counter", "Upstream API attempts, including retries.", "gateway",
+         {name: s["calls"] for name, s in gateways.items()}),
+        ("neplaunch_upstream_retries_total", "counter", "Upstream attempts that were retried.", "gateway",
+         {name: s["retries"] for name, s in gateways.items()}),
+        ("neplaunch_upstream_failures_total", "counter", "Upstream calls that failed after retries.", "gateway",
+         {name: s["failures"] for name, s in gateways.items()}),
+        ("neplaunch_upstream_rejected_total", "counter", "Calls refused by the circuit breaker or concurrency limit.",
+         "gateway", {name: s["rejected"] for name, s in gateways.items()}),
+        ("neplaunch_upstream_circuit_open", "gauge", "1 while the circuit breaker is open or half-open.", "gateway",
+         {name: int(s["state"] != "closed") for name, s in gateways.items()}),
+    ]
+    lines = []
+    for family in families:
+        lines.extend(_family(*family))
+    return lines
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition of request latencies, spans and service state."""
+    lines = request_latency.render() + request_queries.render() + span_latency.render() + _service_metrics()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,80 +1,129 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.auth import get_current_user
 from app.models.user import User, UserRole
 from app.models.startup import Startup, TalentRequirement
 from app.schemas.startup import StartupCreate, StartupResponse, TalentRequirementCreate, TalentRequirementResponse
-from app.services.embeddings import get_embedding, build_startup_text, build_requirement_text
+from app.services.embeddings import build_startup_text, build_requirement_text
+from app.services.embedding_queue import embedding_queue
+from app.services.ai_copilot import team_gaps_input
+from app.services.skill_index import requirement_skill_index
+from app.services.skill_vocabulary import intern_skills
+from app.services.user_cache import user_cache
+from app.pagination import (
+    PageParams, NEXT_CURSOR_HEADER, decode_cursor, fetch_page, parse_fields, projection_columns,
+    projected_response,
+)
 
 router = APIRouter(prefix="/api/startups", tags=["startups"])
 
 
 @router.post("", response_model=StartupResponse)
-def create_startup(data: StartupCreate, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_startup(data: StartupCreate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     if user.role != UserRole.FOUNDER:
         raise HTTPException(status_code=403, detail="Only founders can create startups")
     if user.startup:
         raise HTTPException(status_code=400, detail="You already have a startup profile")
 
-    startup = Startup(**data.model_dump(), founder_id=user.id)
-    startup.embedding = get_embedding(build_startup_text(startup))
+    startup = Startup(**data.model_dump(), founder_id=user.id, embedding_pending=1)
     db.add(startup)
-    db.commit()
-    db.refresh(startup)
+    await db.commit()
+    await db.refresh(startup)
+    user_cache.invalidate(user.id)
+    embedding_queue.enqueue("startup", startup.id, build_startup_text(startup))
     return StartupResponse.model_validate(startup)
 
 
 @router.get("/me", response_model=StartupResponse)
-def get_my_startup(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_my_startup(user: User = Depends(get_current_user)):
     if not user.startup:
         raise HTTPException(status_code=404, detail="No startup profile found")
     return StartupResponse.model_validate(user.startup)
 
 
 @router.put("/me", response_model=StartupResponse)
-def update_startup(data: StartupCreate, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def update_startup(data: StartupCreate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     if not user.startup:
         raise HTTPException(status_code=404, detail="No startup profile found")
+    analyzed = team_gaps_input(user.startup)
     for key, val in data.model_dump().items():
         setattr(user.startup, key, val)
-    user.startup.embedding = get_embedding(build_startup_text(user.startup))
-    db.commit()
-    db.refresh(user.startup)
+    if team_gaps_input(user.startup) != analyzed:
+        user.startup.team_gaps = None  # the stored team-gap analysis no longer describes this startup
+    user.startup.embedding_pending = 1
+    await db.commit()
+    await db.refresh(user.startup)
+    user_cache.invalidate(user.id)
+    embedding_queue.enqueue("startup", user.startup.id, build_startup_text(user.startup))
     return StartupResponse.model_validate(user.startup)
 
 
 @router.get("", response_model=list[StartupResponse])
-def list_startups(db: Session = Depends(get_db)):
-    return [StartupResponse.model_validate(s) for s in db.query(Startup).all()]
+async def list_startups(response: Response, page: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    fields = parse_fields(page.fields, StartupResponse.model_fields)
+    query = select(Startup) if fields is None else select(*projection_columns(Startup, fields, "id"))
+    if page.cursor:
+        (last_id,) = decode_cursor(page.cursor, 1)
+        query = query.where(Startup.id > last_id)
+    rows, next_cursor = await fetch_page(
+        db, query.order_by(Startup.id), page.limit, lambda r: (r.id,), entities=fields is None,
+    )
+    if fields is not None:
+        return projected_response([{f: getattr(r, f) for f in fields} for r in rows], next_cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [StartupResponse.model_validate(s) for s in rows]
 
 
 # --- Talent Requirements ---
 
 @router.post("/requirements", response_model=TalentRequirementResponse)
-def create_requirement(
+async def create_requirement(
     data: TalentRequirementCreate,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     if not user.startup:
         raise HTTPException(status_code=400, detail="Create a startup profile first")
-    req = TalentRequirement(**data.model_dump(), startup_id=user.startup.id)
-    req.embedding = get_embedding(build_requirement_text(req))
+    # Before any write: interning a new skill commits on its own connection
+    skill_bits = await run_in_threadpool(intern_skills, data.required_skills)
+    req = TalentRequirement(
+        **data.model_dump(), startup_id=user.startup.id, embedding_pending=1, skill_bits=skill_bits,
+    )
     db.add(req)
-    db.commit()
-    db.refresh(req)
+    await db.commit()
+    await db.refresh(req)
+    embedding_queue.enqueue("requirement", req.id, build_requirement_text(req))
+    requirement_skill_index.replace(req.id, skill_bits)
     return TalentRequirementResponse.model_validate(req)
 
 
 @router.get("/requirements", response_model=list[TalentRequirementResponse])
-def list_my_requirements(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def list_my_requirements(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     if not user.startup:
         return []
-    return [TalentRequirementResponse.model_validate(r) for r in user.startup.requirements]
+    reqs = await db.scalars(
+        select(TalentRequirement).where(TalentRequirement.startup_id == user.startup.id).order_by(TalentRequirement.id)
+    )
+    return [TalentRequirementResponse.model_validate(r) for r in reqs]
 
 
 @router.get("/requirements/all", response_model=list[TalentRequirementResponse])
-def list_all_requirements(db: Session = Depends(get_db)):
-    reqs = db.query(TalentRequirement).filter(TalentRequirement.is_active == 1).all()
-    return [TalentRequirementResponse.model_validate(r) for r in reqs]
+async def list_all_requirements(response: Response, page: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    fields = parse_fields(page.fields, TalentRequirementResponse.model_fields)
+    query = select(TalentRequirement) if fields is None else select(*projection_columns(TalentRequirement, fields, "id"))
+    query = query.where(TalentRequirement.is_active == 1)
+    if page.cursor:
+        (last_id,) = decode_cursor(page.cursor, 1)
+        query = query.where(TalentRequirement.id > last_id)
+    rows, next_cursor = await fetch_page(
+        db, query.order_by(TalentRequirement.id), page.limit, lambda r: (r.id,), entities=fields is None,
+    )
+    if fields is not None:
+        return projected_response([{f: getattr(r, f) for f in fields} for r in rows], next_cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [TalentRequirementResponse.model_validate(r) for r in rows]
@@ -1,25 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.auth import get_current_user
 from app.models.user import User, UserRole
 from app.models.talent import TalentProfile, TalentSkill
 from app.schemas.talent import TalentProfileCreate, TalentProfileResponse
-from app.services.embeddings import get_embedding, build_talent_text
+from app.services.embeddings import build_talent_text
+from app.services.embedding_queue import embedding_queue
+from app.services.skill_index import talent_skill_index
+from app.services.skill_vocabulary import intern_skills
+from app.services.user_cache import user_cache
 
 router = APIRouter(prefix="/api/talent", tags=["talent"])
 
 
 @router.post("", response_model=TalentProfileResponse)
-def create_talent_profile(
+async def create_talent_profile(
     data: TalentProfileCreate,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     if user.role != UserRole.TALENT:
         raise HTTPException(status_code=403, detail="Only talent users can create talent profiles")
     if user.talent_profile:
         raise HTTPException(status_code=400, detail="You already have a talent profile")
+    # Before any write: interning a new skill commits on its own connection
+    skill_bits = await run_in_threadpool(intern_skills, [s.name for s in data.skills])
 
     profile = TalentProfile(
         user_id=user.id,
@@ -34,35 +41,40 @@ def create_talent_profile(
         github_url=data.github_url,
         linkedin_url=data.linkedin_url,
         looking_for_cofounder=1 if data.looking_for_cofounder else 0,
+        skill_bits=skill_bits,
     )
     db.add(profile)
-    db.flush()
+    await db.flush()
 
     for skill in data.skills:
         db.add(TalentSkill(profile_id=profile.id, name=skill.name, proficiency=skill.proficiency, years_experience=skill.years_experience))
 
-    profile.embedding = get_embedding(build_talent_text(profile))
-    db.commit()
-    db.refresh(profile)
+    profile.embedding_pending = 1
+    await db.commit()
+    await db.refresh(profile, ["skills"])  # columns stay loaded after commit; reload the new skill rows
+    user_cache.invalidate(user.id)
+    embedding_queue.enqueue("talent", profile.id, build_talent_text(profile))
+    talent_skill_index.replace(profile.id, skill_bits)
     return TalentProfileResponse.model_validate(profile)
 
 
 @router.get("/me", response_model=TalentProfileResponse)
-def get_my_profile(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_my_profile(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     if not user.talent_profile:
         raise HTTPException(status_code=404, detail="No talent profile found")
     return TalentProfileResponse.model_validate(user.talent_profile)
 
 
 @router.put("/me", response_model=TalentProfileResponse)
-def update_talent_profile(
+async def update_talent_profile(
     data: TalentProfileCreate,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     profile = user.talent_profile
     if not profile:
         raise HTTPException(status_code=404, detail="No talent profile found")
+    skill_bits = await run_in_threadpool(intern_skills, [s.name for s in data.skills])
 
     profile.institution = data.institution
     profile.degree = data.degree
@@ -74,15 +86,19 @@ def update_talent_profile(
     profile.github_url = data.github_url
     profile.linkedin_url = data.linkedin_url
     profile.looking_for_cofounder = 1 if data.looking_for_cofounder else 0
+    profile.skill_bits = skill_bits
 
     # Replace skills
     for s in profile.skills:
-        db.delete(s)
-    db.flush()
+        await db.delete(s)
+    await db.flush()
     for skill in data.skills:
         db.add(TalentSkill(profile_id=profile.id, name=skill.name, proficiency=skill.proficiency, years_experience=skill.years_experience))
 
-    profile.embedding = get_embedding(build_talent_text(profile))
-    db.commit()
-    db.refresh(profile)
+    profile.embedding_pending = 1
+    await db.commit()
+    await db.refresh(profile, ["skills"])  # columns stay loaded after commit; reload the new skill rows
+    user_cache.invalidate(user.id)
+    embedding_queue.enqueue("talent", profile.id, build_talent_text(profile))
+    talent_skill_index.replace(profile.id, skill_bits)
     return TalentProfileResponse.model_validate(profile)
@@ -18,7 +18,7 @@ class StartupCreate(BaseModel):
 class StartupResponse(StartupCreate):
     id: int
     founder_id: int
-    team_gaps: list | None = None
+    team_gaps: dict | None = None
 
     class Config:
         from_attributes = True
@@ -1,74 +1,171 @@
 """AI Pitch Co-Pilot and Team Gap Analysis services."""
+import asyncio
 import json
-from openai import OpenAI
+import logging
+from collections.abc import AsyncIterator
+from fastapi.concurrency import run_in_threadpool
+from openai import OpenAIError
 from app.config import get_settings
+from app.metrics import span
+from app.services.llm_cache import llm_cache
+from app.services.llm_gateway import UpstreamUnavailable, chat_gateway, get_async_client
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
+MODEL = "gpt-4o-mini"
 
-def analyze_pitch(pitch_text: str) -> dict:
-    """Analyze pitch text and return structured feedback."""
+# Bump a version whenever its prompt changes, so cached answers to the old prompt are not reused
+PITCH_PROMPT_VERSION = "pitch-v1"
+PITCH_PROMPT = (
+    "You are an experienced startup investor evaluating a pitch from a Nepali startup. "
+    "Analyze the pitch and return a JSON object with these fields:\n"
+    "- overall_score (1-100)\n"
+    "- market_size: {score: 1-10, feedback: string}\n"
+    "- traction: {score: 1-10, feedback: string}\n"
+    "- team: {score: 1-10, feedback: string}\n"
+    "- defensibility: {score: 1-10, feedback: string}\n"
+    "- summary: string (2-3 sentences)\n"
+    "- suggestions: [string] (3-5 actionable suggestions)\n"
+    "Return ONLY valid JSON, no markdown."
+)
+
+TEAM_GAPS_PROMPT_VERSION = "team-gaps-v1"
+TEAM_GAPS_PROMPT = (
+    "You are a startup team advisor. Analyze the startup profile and identify "
+    "missing team roles that would improve investor readiness. Return JSON:\n"
+    "- missing_roles: [{role: string, importance: 'critical'|'important'|'nice_to_have', "
+    "reason: string}]\n"
+    "- investor_readiness_score: 1-100\n"
+    "- summary: string\n"
+    "Return ONLY valid JSON."
+)
+TEAM_GAPS_FIELDS = ("name", "industry", "stage", "team_size", "description")
+
+# Without an API key the mock feedback is streamed in small pieces, like a real completion
+MOCK_STREAM_CHUNK_CHARS = 24
+MOCK_STREAM_DELAY = 0.02
+
+
+def _messages(system_prompt: str, user_content: str) -> list[dict]:
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_content},
+    ]
+
+
+async def _complete_json(prompt_version: str, system_prompt: str, user_content: str) -> dict | None:
+    """A JSON completion, served from the LLM cache when this exact input was seen before.
+
+    Returns None without an API key, when the upstream is unavailable (see
+    llm_gateway) or rejects the request, or when the model's answer is not a
+    JSON object, so callers fall back to the mock answer.
+    """
     if not settings.OPENAI_API_KEY:
-        return _mock_pitch_feedback()
-
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are an experienced startup investor evaluating a pitch from a Nepali startup. "
-                    "Analyze the pitch and return a JSON object with these fields:\n"
-                    "- overall_score (1-100)\n"
-                    "- market_size: {score: 1-10, feedback: string}\n"
-                    "- traction: {score: 1-10, feedback: string}\n"
-                    "- team: {score: 1-10, feedback: string}\n"
-                    "- defensibility: {score: 1-10, feedback: string}\n"
-                    "- summary: string (2-3 sentences)\n"
-                    "- suggestions: [string] (3-5 actionable suggestions)\n"
-                    "Return ONLY valid JSON, no markdown."
-                ),
-            },
-            {"role": "user", "content": pitch_text},
-        ],
-        temperature=0.7,
-    )
+        return None
+    cached = await run_in_threadpool(llm_cache.get, MODEL, prompt_version, user_content)
+    if cached is not None:
+        return cached
+
     try:
-        return json.loads(response.choices[0].message.content)
-    except (json.JSONDecodeError, IndexError):
-        return _mock_pitch_feedback()
+        response = await chat_gateway.acall(lambda: get_async_client().chat.completions.create(
+            model=MODEL,
+            messages=_messages(system_prompt, user_content),
+            temperature=0.7,
+        ))
+    except UpstreamUnavailable:
+        return None
+    except OpenAIError:
+        # Not transient (bad key, rejected request); retrying will not help
+        logger.exception("LLM request for %s failed", prompt_version)
+        return None
+    try:
+        result = json.loads(response.choices[0].message.content)
+    except (json.JSONDecodeError, IndexError, TypeError):
+        # TypeError: no content, e.g. a refusal
+        logger.warning("LLM answer for %s is not JSON", prompt_version)
+        return None
+    if not isinstance(result, dict):
+        logger.warning("LLM answer for %s is not a JSON object", prompt_version)
+        return None
+    await run_in_threadpool(llm_cache.put, MODEL, prompt_version, user_content, result)
+    return result
 
 
-def analyze_team_gaps(startup_data: dict) -> dict:
-    """Analyze startup team and identify gaps affecting investor readiness."""
+async def analyze_pitch(pitch_text: str) -> dict:
+    """Analyze pitch text and return structured feedback."""
+    with span("llm.pitch_feedback"):
+        result = await _complete_json(PITCH_PROMPT_VERSION, PITCH_PROMPT, pitch_text)
+    return result if result is not None else _mock_pitch_feedback()
+
+
+async def stream_pitch_feedback(pitch_text: str) -> AsyncIterator[tuple[str, object]]:
+    """Pitch feedback as it is generated.
+
+    Yields ("delta", text) for each piece of the model's JSON as it arrives,
+    then one ("result", feedback). A cached answer arrives as the result alone.
+    """
     if not settings.OPENAI_API_KEY:
-        return _mock_team_gaps()
-
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a startup team advisor. Analyze the startup profile and identify "
-                    "missing team roles that would improve investor readiness. Return JSON:\n"
-                    "- missing_roles: [{role: string, importance: 'critical'|'important'|'nice_to_have', "
-                    "reason: string}]\n"
-                    "- investor_readiness_score: 1-100\n"
-                    "- summary: string\n"
-                    "Return ONLY valid JSON."
-                ),
-            },
-            {"role": "user", "content": json.dumps(startup_data)},
-        ],
+        text = json.dumps(_mock_pitch_feedback())
+        for start in range(0, len(text), MOCK_STREAM_CHUNK_CHARS):
+            yield "delta", text[start:start + MOCK_STREAM_CHUNK_CHARS]
+            await asyncio.sleep(MOCK_STREAM_DELAY)
+        yield "result", _mock_pitch_feedback()
+        return
+
+    cached = await run_in_threadpool(llm_cache.get, MODEL, PITCH_PROMPT_VERSION, pitch_text)
+    if cached is not None:
+        yield "result", cached
+        return
+
+    stream = chat_gateway.astream(lambda: get_async_client().chat.completions.create(
+        model=MODEL,
+        messages=_messages(PITCH_PROMPT, pitch_text),
         temperature=0.7,
-    )
+        stream=True,
+    ))
+    parts = []
+    try:
+        async for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if text:
+                parts.append(text)
+                yield "delta", text
+    except (UpstreamUnavailable, OpenAIError) as exc:
+        if parts:
+            raise
+        if not isinstance(exc, UpstreamUnavailable):
+            logger.exception("LLM request for %s failed", PITCH_PROMPT_VERSION)
+        # Nothing sent yet, so the client can still get the offline answer
+        yield "result", _mock_pitch_feedback()
+        return
     try:
-        return json.loads(response.choices[0].message.content)
-    except (json.JSONDecodeError, IndexError):
-        return _mock_team_gaps()
+        result = json.loads("".join(parts))
+    except json.JSONDecodeError:
+        yield "result", _mock_pitch_feedback()
+        return
+    if not isinstance(result, dict):
+        yield "result", _mock_pitch_feedback()
+        return
+    await run_in_threadpool(llm_cache.put, MODEL, PITCH_PROMPT_VERSION, pitch_text, result)
+    yield "result", result
+
+
+def team_gaps_input(startup) -> dict:
+    """The startup fields the team-gap analysis looks at."""
+    return {field: getattr(startup, field) for field in TEAM_GAPS_FIELDS}
+
+
+async def fetch_team_gaps(startup_data: dict) -> dict | None:
+    """Team-gap analysis from the model, or None when it is unavailable."""
+    with span("llm.team_gaps"):
+        return await _complete_json(TEAM_GAPS_PROMPT_VERSION, TEAM_GAPS_PROMPT, json.dumps(startup_data))
+
+
+async def analyze_team_gaps(startup_data: dict) -> dict:
+    """Analyze startup team and identify gaps affecting investor readiness."""
+    result = await fetch_team_gaps(startup_data)
+    return result if result is not None else mock_team_gaps()
 
 
 def _mock_pitch_feedback() -> dict:
@@ -88,7 +185,7 @@ def _mock_pitch_feedback() -> dict:
     }
 
 
-def _mock_team_gaps() -> dict:
+def mock_team_gaps() -> dict:
     return {
         "missing_roles": [
             {"role": "CTO", "importance": "critical", "reason": "Technical leadership needed to build and scale the product."},
@@ -0,0 +1,88 @@
+"""Persistent content-addressed cache for embedding API responses.
+
+Entries are keyed by (model, SHA-256 of the input text) and kept in a local
+SQLite file, so re-saving an unchanged profile costs no API call. The least
+recently used entries are evicted once the cache grows past its size cap.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+import numpy as np
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def cache_key(model: str, text: str) -> str:
+    return f"{model}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+
+class EmbeddingCache:
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "key TEXT PRIMARY KEY, embedding BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_embedding_cache_last_used ON embedding_cache (last_used)")
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get(self, model: str, text: str) -> list[float] | None:
+        key = cache_key(model, text)
+        with self._lock:
+            row = self._conn.execute("SELECT embedding FROM embedding_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE embedding_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        return np.frombuffer(row[0], dtype="<f4").tolist()
+
+    def put(self, model: str, text: str, embedding: list[float]) -> None:
+        key = cache_key(model, text)
+        blob = np.asarray(embedding, dtype="<f4").tobytes()
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM embedding_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embedding_cache (key, embedding, last_used) VALUES (?, ?, ?)",
+                (key, blob, time.time()),
+            )
+            if not exists:
+                self._size += 1
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM embedding_cache WHERE key IN "
+                    "(SELECT key FROM embedding_cache ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+                self._size -= overflow
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM embedding_cache")
+            self._size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": self._size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+embedding_cache = EmbeddingCache(settings.EMBEDDING_CACHE_PATH, settings.EMBEDDING_CACHE_MAX_ENTRIES)
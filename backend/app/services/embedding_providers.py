@@ -0,0 +1,87 @@
+"""Embedding backends, selected with the EMBEDDING_PROVIDER setting.
+
+- ``openai``: text-embedding-3-small over the network (needs OPENAI_API_KEY).
+- ``hashing``: a local feature-hashing vectorizer over word unigrams and bigrams.
+  It is deterministic, needs no network and embeds a profile in well under a
+  millisecond, which makes it suitable for tests, benchmarks and air-gapped installs.
+"""
+import re
+import zlib
+from functools import lru_cache
+import numpy as np
+from app.config import get_settings
+from app.services.llm_gateway import embedding_gateway, get_client
+
+settings = get_settings()
+
+
+class EmbeddingProvider:
+    """Interface every backend implements."""
+
+    model: str
+    max_batch_size: int
+    # Whether results are worth keeping in the persistent embedding cache
+    cached: bool = True
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def embed(self, texts: list[str]) -> list[list[float] | None]:
+        """Embed a batch of at most max_batch_size texts, in input order."""
+        raise NotImplementedError
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    model = "text-embedding-3-small"
+    max_batch_size = 2048  # provider limit on inputs per embeddings request
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def embed(self, texts: list[str]) -> list[list[float] | None]:
+        response = embedding_gateway.call(lambda: get_client().embeddings.create(model=self.model, input=texts))
+        results: list[list[float] | None] = [None] * len(texts)
+        for item in response.data:
+            results[item.index] = item.embedding
+        return results
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    max_batch_size = 10000
+    cached = False  # recomputing is cheaper than a cache lookup
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.model = f"hashing-{dim}"
+
+    def embed(self, texts: list[str]) -> list[list[float] | None]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> list[float] | None:
+        tokens = _TOKEN_RE.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        if not features:
+            return None
+        # crc32 is stable across processes, unlike the salted built-in hash()
+        hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+        vec = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim)
+        norm = np.linalg.norm(vec)
+        return (vec / norm).tolist() if norm > 0 else None
+
+
+@lru_cache()
+def get_provider() -> EmbeddingProvider:
+    if settings.EMBEDDING_PROVIDER == "openai":
+        return OpenAIEmbeddingProvider(settings.OPENAI_API_KEY)
+    if settings.EMBEDDING_PROVIDER == "hashing":
+        return HashingEmbeddingProvider(settings.EMBEDDING_DIM)
+    raise ValueError(f"Unknown EMBEDDING_PROVIDER {settings.EMBEDDING_PROVIDER!r}")
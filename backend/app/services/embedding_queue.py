@@ -0,0 +1,122 @@
+"""Background embedding computation, off the request path.
+
+Write handlers mark a row ``embedding_pending`` and enqueue its text; a small
+pool of worker threads fetches the embedding, persists it, clears the flag and
+updates the in-memory vector index. Until then matching keeps using the row's
+previous vector (or scores it skill-only if it has none). If the provider is
+unavailable the row keeps that vector and stays pending. Pending rows are
+queued again when the API starts (jobs do not survive a restart), and
+backfill_embeddings.py retries them in bulk.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from sqlalchemy import update
+from sqlalchemy.orm import Session, selectinload
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.startup import Startup, TalentRequirement
+from app.models.talent import TalentProfile
+from app.models.investor import InvestorProfile
+from app.services.embeddings import (
+    get_embedding, build_talent_text, build_startup_text, build_requirement_text, build_investor_text,
+)
+from app.services.vector_index import talent_index, startup_index, requirement_index, investor_index
+
+settings = get_settings()
+
+TARGETS = {
+    "talent": (TalentProfile, talent_index),
+    "startup": (Startup, startup_index),
+    "requirement": (TalentRequirement, requirement_index),
+    "investor": (InvestorProfile, investor_index),
+}
+
+TEXTS = {
+    "talent": (build_talent_text, [selectinload(TalentProfile.skills)]),
+    "startup": (build_startup_text, []),
+    "requirement": (build_requirement_text, []),
+    "investor": (build_investor_text, []),
+}
+
+
+class EmbeddingQueue:
+    def __init__(self, workers: int):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embedding")
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._versions: dict[tuple[str, int], int] = {}
+        self._futures: set[Future] = set()
+
+    def enqueue(self, kind: str, item_id: int, text: str) -> Future:
+        """Schedule an embedding for one row. A later enqueue for the same row supersedes it."""
+        key = (kind, item_id)
+        with self._lock:
+            version = self._versions.get(key, 0) + 1
+            self._versions[key] = version
+            future = self._pool.submit(self._run, key, version, text)
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._versions)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until every job queued so far has finished."""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures, timeout=timeout)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _run(self, key: tuple[str, int], version: int, text: str) -> None:
+        kind, item_id = key
+        try:
+            embedding = get_embedding(text)
+            if embedding is None:
+                # Provider unavailable: keep the previous vector and leave the row
+                # pending, so backfill_embeddings.py retries it later
+                return
+            model, index = TARGETS[kind]
+            # Serialize the write so a superseded job can never land after a newer one
+            with self._write_lock:
+                with self._lock:
+                    if self._versions.get(key) != version:
+                        return
+                db = SessionLocal()
+                try:
+                    db.execute(
+                        update(model).where(model.id == item_id).values(embedding=embedding, embedding_pending=0)
+                    )
+                    db.commit()
+                finally:
+                    db.close()
+                index.upsert(item_id, embedding)
+        finally:
+            with self._lock:
+                if self._versions.get(key) == version:
+                    del self._versions[key]
+
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+
+embedding_queue = EmbeddingQueue(settings.EMBEDDING_WORKERS)
+
+
+def enqueue_pending(db: Session) -> int:
+    """Queue every row still marked embedding_pending. Returns how many were queued.
+
+    Called at startup: the jobs of a previous process, and rows the provider
+    could not embed, are otherwise left pending until a manual backfill.
+    """
+    queued = 0
+    for kind, (model, _) in TARGETS.items():
+        build_text, options = TEXTS[kind]
+        for row in db.query(model).options(*options).filter(model.embedding_pending == 1).yield_per(500):
+            embedding_queue.enqueue(kind, row.id, build_text(row))
+            queued += 1
+    return queued
@@ -1,23 +1,53 @@
-"""OpenAI embedding service for semantic matching."""
-from openai import OpenAI
-from app.config import get_settings
-
-settings = get_settings()
+"""Embedding service for semantic matching."""
+from app.metrics import span
+from app.services.embedding_cache import embedding_cache
+from app.services.embedding_providers import get_provider
 
 
 def get_embedding(text: str) -> list[float] | None:
-    """Get OpenAI embedding for text. Returns None if API key not configured."""
-    if not settings.OPENAI_API_KEY:
-        return None
-    try:
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        response = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text,
-        )
-        return response.data[0].embedding
-    except Exception:
-        return None
+    """Get an embedding for text. Returns None if the provider is unavailable (no API key).
+
+    Results are cached by (model, text hash), so unchanged text never hits the API twice.
+    """
+    return get_embeddings([text])[0]
+
+
+def get_embeddings(texts: list[str]) -> list[list[float] | None]:
+    """Embed many texts with as few requests as possible, in input order.
+
+    Cached texts are served locally; the rest are de-duplicated and sent in chunks
+    of the provider's max batch size. Entries are None if the provider is
+    unavailable or their chunk failed. Timed as the embeddings.get span.
+    """
+    provider = get_provider()
+    if not provider.available:
+        return [None] * len(texts)
+    with span("embeddings.get"):
+        return _get_embeddings(provider, texts)
+
+
+def _get_embeddings(provider, texts: list[str]) -> list[list[float] | None]:
+    results: dict[str, list[float] | None] = {}
+    misses = []
+    for text in dict.fromkeys(texts):
+        cached = embedding_cache.get(provider.model, text) if provider.cached else None
+        if cached is not None:
+            results[text] = cached
+        else:
+            misses.append(text)
+
+    for start in range(0, len(misses), provider.max_batch_size):
+        chunk = misses[start:start + provider.max_batch_size]
+        try:
+            embeddings = provider.embed(chunk)
+        except Exception:
+            continue
+        for text, embedding in zip(chunk, embeddings):
+            results[text] = embedding
+            if provider.cached and embedding is not None:
+                embedding_cache.put(provider.model, text, embedding)
+
+    return [results.get(text) for text in texts]
 
 
 def build_talent_text(profile) -> str:
@@ -0,0 +1,96 @@
+"""Persistent cache for LLM completions (pitch feedback, team-gap analysis).
+
+Entries are keyed by a SHA-256 of (model, prompt version, input), so a
+re-submitted pitch is answered locally, while bumping a prompt version or
+switching models starts afresh. Entries expire after a TTL, and the least
+recently used ones are evicted once the cache grows past its size cap.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def cache_key(model: str, prompt_version: str, text: str) -> str:
+    digest = hashlib.sha256("\0".join((model, prompt_version, text)).encode("utf-8")).hexdigest()
+    return f"{model}:{prompt_version}:{digest}"
+
+
+class LLMCache:
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache (last_used)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_expires_at ON llm_cache (expires_at)")
+        self._size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get(self, model: str, prompt_version: str, text: str) -> dict | None:
+        key = cache_key(model, prompt_version, text)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, model: str, prompt_version: str, text: str, response: dict) -> None:
+        key = cache_key(model, prompt_version, text)
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), now + self.ttl, now),
+            )
+            if not exists:
+                self._size += 1
+            # Expired entries go first, then the least recently used beyond the cap
+            self._size -= self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+                self._size -= overflow
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": self._size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+llm_cache = LLMCache(settings.LLM_CACHE_PATH, settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL_SECONDS)
@@ -0,0 +1,284 @@
+"""One guarded path to the OpenAI API for embeddings and chat completions.
+
+Every upstream call goes through a Gateway, which gives it:
+
+- a shared, pooled HTTP client with a per-attempt deadline,
+- a concurrency limit, so a slow upstream holds at most that many callers
+  (the rest give up after the deadline instead of queueing forever),
+- retries with full-jitter exponential backoff for transient failures
+  (timeouts, connection errors, 408/409/429 and 5xx),
+- a circuit breaker: after UPSTREAM_BREAKER_THRESHOLD consecutive failures
+  calls are refused for UPSTREAM_BREAKER_COOLDOWN_SECONDS, then a single trial
+  call decides whether to close it again.
+
+When a call cannot be made or keeps failing the gateway raises
+UpstreamUnavailable, and callers take their offline path (mock feedback,
+no embedding) at once. Set OPENAI_BASE_URL to point the clients elsewhere,
+e.g. at ``fake_upstream.py``.
+"""
+import asyncio
+import random
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import TypeVar
+import httpx
+import openai
+from openai import AsyncOpenAI, OpenAI
+from app.config import get_settings
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+class UpstreamUnavailable(Exception):
+    """The upstream was not called (breaker open, no free slot) or failed after retries."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, (openai.APIConnectionError, asyncio.TimeoutError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS or exc.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (one trial call) -> closed."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self.trial_running:
+                return False
+            self.trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+    def release_trial(self) -> None:
+        """A call ended without an outcome (cancelled); if it was the trial, reopen."""
+        with self._lock:
+            if self.trial_running:
+                self.opened_at = time.monotonic()
+                self.trial_running = False
+
+
+class Gateway:
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        max_concurrency: int,
+        max_retries: int,
+        retry_base_delay: float,
+        breaker: CircuitBreaker,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.breaker = breaker
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._async_slots: asyncio.Semaphore | None = None
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """Run a blocking upstream call under the gateway's limits."""
+        with self._slot():
+            for attempt in range(self.max_retries + 1):
+                self._admit()
+                try:
+                    result = fn()
+                except Exception as exc:
+                    delay = self._failed(exc, attempt)
+                    time.sleep(delay)
+                    continue
+                except BaseException:
+                    self.breaker.release_trial()
+                    raise
+                self.breaker.record_success()
+                return result
+        raise AssertionError("unreachable")
+
+    async def acall(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await an upstream call under the gateway's limits."""
+        async with self._async_slot():
+            return await self._attempts(fn)
+
+    async def astream(self, fn: Callable[[], Awaitable[AsyncIterator[T]]]) -> AsyncIterator[T]:
+        """Open a streaming call and yield its items, holding a slot until the stream ends.
+
+        Only opening the stream is retried; items already yielded cannot be taken back.
+        """
+        async with self._async_slot():
+            stream = await self._attempts(fn)
+            try:
+                async for item in stream:
+                    yield item
+            except Exception as exc:
+                if not is_transient(exc):
+                    raise
+                self.breaker.record_failure()
+                self._count("failures")
+                raise UpstreamUnavailable(f"{self.name} stream failed") from exc
+
+    def stats(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+        }
+
+    async def _attempts(self, fn: Callable[[], Awaitable[T]]) -> T:
+        for attempt in range(self.max_retries + 1):
+            self._admit()
+            try:
+                result = await asyncio.wait_for(fn(), self.timeout)
+            except Exception as exc:
+                await asyncio.sleep(self._failed(exc, attempt))
+                continue
+            except BaseException:
+                # Cancelled (client gone, outer timeout): a trial left running would keep the breaker shut
+                self.breaker.release_trial()
+                raise
+            self.breaker.record_success()
+            return result
+        raise AssertionError("unreachable")
+
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise UpstreamUnavailable(f"{self.name} circuit is open")
+        self._count("calls")
+
+    def _failed(self, exc: Exception, attempt: int) -> float:
+        """Account for a failed attempt; return the backoff before the next one, or raise."""
+        if not is_transient(exc):
+            # The upstream answered; a bad request says nothing about its health
+            self.breaker.record_success()
+            raise exc
+        self.breaker.record_failure()
+        if attempt == self.max_retries:
+            self._count("failures")
+            raise UpstreamUnavailable(f"{self.name} failed after {attempt + 1} attempts") from exc
+        self._count("retries")
+        return random.uniform(0, self.retry_base_delay * 2 ** attempt)
+
+    @contextmanager
+    def _slot(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            self._count("rejected")
+            raise UpstreamUnavailable(f"{self.name} has no free slot")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def _async_slot(self):
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            await asyncio.wait_for(self._async_slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self._count("rejected")
+            raise UpstreamUnavailable(f"{self.name} has no free slot") from None
+        try:
+            yield
+        finally:
+            self._async_slots.release()
+
+    def _count(self, field: str) -> None:
+        with self._stats_lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+
+def _gateway(name: str, timeout: float) -> Gateway:
+    return Gateway(
+        name,
+        timeout=timeout,
+        max_concurrency=settings.UPSTREAM_MAX_CONCURRENCY,
+        max_retries=settings.UPSTREAM_MAX_RETRIES,
+        retry_base_delay=settings.UPSTREAM_RETRY_BASE_DELAY,
+        breaker=CircuitBreaker(settings.UPSTREAM_BREAKER_THRESHOLD, settings.UPSTREAM_BREAKER_COOLDOWN_SECONDS),
+    )
+
+
+# Separate limits and breakers: a struggling chat model should not stop embeddings
+chat_gateway = _gateway("chat", settings.LLM_TIMEOUT_SECONDS)
+embedding_gateway = _gateway("embeddings", settings.EMBEDDING_TIMEOUT_SECONDS)
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.UPSTREAM_MAX_CONCURRENCY,
+        max_keepalive_connections=settings.UPSTREAM_MAX_CONCURRENCY,
+    )
+
+
+@lru_cache()
+def get_client() -> OpenAI:
+    """Shared blocking client (embeddings); the gateway retries, so the SDK does not."""
+    timeout = embedding_gateway.timeout
+    return OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL or None,
+        timeout=timeout,
+        max_retries=0,
+        http_client=httpx.Client(timeout=timeout, limits=_limits()),
+    )
+
+
+@lru_cache()
+def get_async_client() -> AsyncOpenAI:
+    """Shared async client (chat); requests await the API without holding a worker thread."""
+    timeout = chat_gateway.timeout
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL or None,
+        timeout=timeout,
+        max_retries=0,
+        http_client=httpx.AsyncClient(timeout=timeout, limits=_limits()),
+    )
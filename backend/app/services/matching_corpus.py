@@ -0,0 +1,131 @@
+"""Bulk loader for the data the matching engine scores against.
+
+Each part of the corpus is fetched with one or two column-only queries the
+first time it is used, so a full matching refresh issues a fixed number of
+queries no matter how many profiles exist, and never touches the embedding
+columns (those live in the in-memory vector indexes). Loads are timed as the
+matching.load span.
+"""
+from sqlalchemy.orm import Session
+from app.metrics import span
+from app.models.startup import Startup, TalentRequirement
+from app.models.talent import TalentProfile
+from app.models.investor import InvestorProfile
+
+
+class TalentRecord:
+    __slots__ = ("id", "user_id")
+
+    def __init__(self, id: int, user_id: int):
+        self.id = id
+        self.user_id = user_id
+
+
+class RequirementRecord:
+    __slots__ = ("id", "startup_id", "founder_id", "required_skills", "is_active")
+
+    def __init__(self, id: int, startup_id: int, founder_id: int | None, required_skills: list[str], is_active: int):
+        self.id = id
+        self.startup_id = startup_id
+        self.founder_id = founder_id
+        self.required_skills = required_skills
+        self.is_active = is_active
+
+
+class StartupRecord:
+    __slots__ = ("id", "founder_id", "industry", "stage", "funding_ask")
+
+    def __init__(self, id: int, founder_id: int, industry: str | None, stage: str | None, funding_ask: float | None):
+        self.id = id
+        self.founder_id = founder_id
+        self.industry = industry
+        self.stage = stage
+        self.funding_ask = funding_ask
+
+
+class InvestorRecord:
+    __slots__ = (
+        "id", "user_id", "preferred_sectors", "preferred_stages", "check_size_min", "check_size_max",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        user_id: int,
+        preferred_sectors: list[str] | None,
+        preferred_stages: list[str] | None,
+        check_size_min: float | None,
+        check_size_max: float | None,
+    ):
+        self.id = id
+        self.user_id = user_id
+        self.preferred_sectors = preferred_sectors
+        self.preferred_stages = preferred_stages
+        self.check_size_min = check_size_min
+        self.check_size_max = check_size_max
+
+
+class MatchingCorpus:
+    """Lazily loaded, read-only snapshot of talents, requirements, startups and investors."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._talents: dict[int, TalentRecord] | None = None
+        self._requirements: list[RequirementRecord] | None = None
+        self._startups: list[StartupRecord] | None = None
+        self._investors: list[InvestorRecord] | None = None
+
+    @property
+    def talents(self) -> dict[int, TalentRecord]:
+        """Talent records keyed by profile ID. Their skills live in talent_skill_index."""
+        if self._talents is None:
+            with span("matching.load"):
+                self._talents = {
+                    profile_id: TalentRecord(profile_id, user_id)
+                    for profile_id, user_id in self.db.query(TalentProfile.id, TalentProfile.user_id)
+                }
+        return self._talents
+
+    @property
+    def requirements(self) -> list[RequirementRecord]:
+        """Every requirement with its startup's founder, in ID order."""
+        if self._requirements is None:
+            with span("matching.load"):
+                rows = (
+                    self.db.query(
+                        TalentRequirement.id,
+                        TalentRequirement.startup_id,
+                        Startup.founder_id,
+                        TalentRequirement.required_skills,
+                        TalentRequirement.is_active,
+                    )
+                    .outerjoin(Startup, Startup.id == TalentRequirement.startup_id)
+                    .order_by(TalentRequirement.id)
+                )
+                self._requirements = [RequirementRecord(*row) for row in rows]
+        return self._requirements
+
+    @property
+    def startups(self) -> list[StartupRecord]:
+        if self._startups is None:
+            with span("matching.load"):
+                rows = self.db.query(
+                    Startup.id, Startup.founder_id, Startup.industry, Startup.stage, Startup.funding_ask,
+                ).order_by(Startup.id)
+                self._startups = [StartupRecord(*row) for row in rows]
+        return self._startups
+
+    @property
+    def investors(self) -> list[InvestorRecord]:
+        if self._investors is None:
+            with span("matching.load"):
+                rows = self.db.query(
+                    InvestorProfile.id,
+                    InvestorProfile.user_id,
+                    InvestorProfile.preferred_sectors,
+                    InvestorProfile.preferred_stages,
+                    InvestorProfile.check_size_min,
+                    InvestorProfile.check_size_max,
+                ).order_by(InvestorProfile.id)
+                self._investors = [InvestorRecord(*row) for row in rows]
+        return self._investors
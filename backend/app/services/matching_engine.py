@@ -3,13 +3,20 @@ NepLaunch AI Matching Engine
 Hybrid algorithm: 60% skill overlap scoring + 40% semantic embedding similarity
 """
 import numpy as np
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from app.metrics import span
 from app.models.user import User, UserRole
 from app.models.startup import Startup, TalentRequirement
-from app.models.talent import TalentProfile
 from app.models.investor import InvestorProfile
-from app.models.matching import Match
+from app.models.matching import Match, ConnectionRequest
 from app.services.embeddings import get_embedding
+from app.services.vector_index import (
+    talent_index, startup_index, requirement_index, investor_index, top_k,
+)
+from app.services.skill_index import talent_skill_index, requirement_skill_index
+from app.services.skill_vocabulary import skill_count, skill_vocabulary
+from app.services.matching_corpus import MatchingCorpus, RequirementRecord
 
 
 def cosine_similarity(a: list[float], b: list[float]) -> float:
@@ -19,118 +26,197 @@ def cosine_similarity(a: list[float], b: list[float]) -> float:
     return float(dot / norm) if norm > 0 else 0.0
 
 
-def compute_skill_overlap(required: list[str], candidate: list[str]) -> tuple[float, list[str], list[str]]:
-    """Returns (score, matched_skills, missing_skills)"""
-    required_lower = {s.lower() for s in required}
-    candidate_lower = {s.lower() for s in candidate}
-    matched = required_lower & candidate_lower
-    missing = required_lower - candidate_lower
-    score = len(matched) / len(required_lower) if required_lower else 0.0
-    return score, sorted(matched), sorted(missing)
+def requirement_skill_bits(requirement: TalentRequirement | RequirementRecord) -> np.ndarray:
+    """Skill bitset of a requirement: the indexed one if active, else encoded from its names."""
+    bits = requirement_skill_index.bits_of(requirement.id)
+    return bits if bits is not None else skill_vocabulary.encode(requirement.required_skills or [])
 
 
 def match_talent_to_requirement(
     db: Session,
-    requirement: TalentRequirement,
+    requirement: TalentRequirement | RequirementRecord,
     limit: int = 20,
+    corpus: MatchingCorpus | None = None,
 ) -> list[dict]:
-    """Match talent profiles against a specific talent requirement."""
-    talents = db.query(TalentProfile).all()
-    results = []
+    """Match talent profiles against a specific talent requirement.
 
-    for talent in talents:
-        candidate_skills = [s.name for s in talent.skills]
-        skill_score, matched, missing = compute_skill_overlap(
-            requirement.required_skills or [], candidate_skills
-        )
+    Only talents sharing a required skill (one popcount pass over the skill
+    bitsets) plus the semantic top-k are scored; every other talent has a lower
+    overall score than one of those, so the top results are the same as a full
+    scan. Matched and missing skill names are decoded for the winners only.
+    """
+    corpus = corpus or MatchingCorpus(db)
+    required_bits = requirement_skill_bits(requirement)
+    overlap_ids, overlap_counts = talent_skill_index.overlap_counts(required_bits)
+    query = requirement_index.get(requirement.id)
+    semantic_ids = np.array([talent_id for talent_id, _ in talent_index.search(query, limit)], dtype=np.int64)
+    candidate_ids = np.union1d(overlap_ids, semantic_ids)
+    if len(candidate_ids) == 0:
+        return []
 
-        # Semantic similarity
-        semantic_score = 0.0
-        if requirement.embedding and talent.embedding:
-            semantic_score = cosine_similarity(requirement.embedding, talent.embedding)
+    required_count = skill_count(required_bits)
+    skill_scores = np.zeros(len(candidate_ids))
+    if required_count:
+        skill_scores[np.searchsorted(candidate_ids, overlap_ids)] = overlap_counts / required_count
+    semantic_scores = talent_index.scores(query, candidate_ids.tolist())
 
-        overall = (0.6 * skill_score) + (0.4 * semantic_score)
+    overall = (0.6 * skill_scores) + (0.4 * semantic_scores)
+    # minimum threshold; rank on the rounded score like the stored value
+    ranked = np.where(overall > 0.1, np.round(overall, 3), -np.inf)
+    winners = [i for i in top_k(ranked, limit) if ranked[i] > -np.inf]
+    results = []
+    for i in winners:
+        talent = corpus.talents.get(int(candidate_ids[i]))
+        if talent is None:
+            continue
+        matched, missing = skill_vocabulary.explain(required_bits, talent_skill_index.bits_of(talent.id))
+        results.append({
+            "talent_user_id": talent.user_id,
+            "overall_score": round(float(overall[i]), 3),
+            "skill_overlap_score": round(float(skill_scores[i]), 3),
+            "semantic_score": round(float(semantic_scores[i]), 3),
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "requirement_id": requirement.id,
+        })
+    return results
 
-        if overall > 0.1:  # minimum threshold
-            results.append({
-                "talent_user_id": talent.user_id,
-                "overall_score": round(overall, 3),
-                "skill_overlap_score": round(skill_score, 3),
-                "semantic_score": round(semantic_score, 3),
-                "matched_skills": matched,
-                "missing_skills": missing,
-                "requirement_id": requirement.id,
-            })
 
-    results.sort(key=lambda x: x["overall_score"], reverse=True)
-    return results[:limit]
+def _thesis_reasons(sector_match: bool, stage_match: bool, check_match: bool) -> list[str]:
+    return [
+        reason for reason, hit in (
+            ("sector_match", sector_match),
+            ("stage_match", stage_match),
+            ("check_size_match", check_match),
+        ) if hit
+    ]
 
 
 def match_startup_to_investors(
     db: Session,
     startup: Startup,
     limit: int = 20,
+    corpus: MatchingCorpus | None = None,
 ) -> list[dict]:
-    """Match a startup to investors based on thesis alignment."""
-    investors = db.query(InvestorProfile).all()
+    """Match a startup to investors based on thesis alignment.
+
+    Scoring fills one array per criterion across all investors and picks the
+    top `limit` with top_k; the reason lists and result dicts are only built
+    for those.
+    """
+    investors = (corpus or MatchingCorpus(db)).investors
+    if not investors:
+        return []
+
+    n = len(investors)
+    industry = (startup.industry or "").lower()
+    stage = (startup.stage or "").lower()
+    funding_ask = startup.funding_ask or 0.0
+    sector_match = np.fromiter(
+        (industry in map(str.lower, inv.preferred_sectors or ()) for inv in investors), dtype=bool, count=n,
+    ) & (industry != "")
+    stage_match = np.fromiter(
+        (stage in map(str.lower, inv.preferred_stages or ()) for inv in investors), dtype=bool, count=n,
+    ) & (stage != "")
+    check_min = np.fromiter((inv.check_size_min or 0.0 for inv in investors), dtype=np.float64, count=n)
+    check_max = np.fromiter((inv.check_size_max or np.inf for inv in investors), dtype=np.float64, count=n)
+    check_match = (check_min != 0) & (funding_ask != 0) & (check_min <= funding_ask) & (funding_ask <= check_max)
+
+    score = np.where(sector_match, 0.3, 0.0) + np.where(stage_match, 0.2, 0.0) + np.where(check_match, 0.1, 0.0)
+    semantic_scores = investor_index.scores(startup_index.get(startup.id), [inv.id for inv in investors])
+    overall = (0.6 * score) + (0.4 * semantic_scores)
+
+    ranked = np.where(overall > 0.05, np.round(overall, 3), -np.inf)
     results = []
+    for i in top_k(ranked, limit):
+        if ranked[i] == -np.inf:
+            continue
+        results.append({
+            "investor_user_id": investors[i].user_id,
+            "overall_score": round(float(overall[i]), 3),
+            "skill_overlap_score": round(float(score[i]), 3),
+            "semantic_score": round(float(semantic_scores[i]), 3),
+            "matched_skills": _thesis_reasons(sector_match[i], stage_match[i], check_match[i]),
+            "missing_skills": [],
+        })
+    return results
 
-    for inv in investors:
-        score = 0.0
-        reasons = []
-
-        # Sector match
-        if inv.preferred_sectors:
-            if startup.industry and startup.industry.lower() in [s.lower() for s in inv.preferred_sectors]:
-                score += 0.3
-                reasons.append("sector_match")
-
-        # Stage match
-        if inv.preferred_stages:
-            if startup.stage and startup.stage.lower() in [s.lower() for s in inv.preferred_stages]:
-                score += 0.2
-                reasons.append("stage_match")
-
-        # Check size match
-        if inv.check_size_min and startup.funding_ask:
-            if inv.check_size_min <= startup.funding_ask <= (inv.check_size_max or float("inf")):
-                score += 0.1
-                reasons.append("check_size_match")
-
-        # Semantic similarity on thesis vs startup description
-        semantic_score = 0.0
-        if startup.embedding and inv.embedding:
-            semantic_score = cosine_similarity(startup.embedding, inv.embedding)
-
-        overall = (0.6 * score) + (0.4 * semantic_score)
-
-        if overall > 0.05:
-            results.append({
-                "investor_user_id": inv.user_id,
-                "overall_score": round(overall, 3),
-                "skill_overlap_score": round(score, 3),
-                "semantic_score": round(semantic_score, 3),
-                "matched_skills": reasons,
-                "missing_skills": [],
-            })
-
-    results.sort(key=lambda x: x["overall_score"], reverse=True)
-    return results[:limit]
-
-
-def run_matching_for_user(db: Session, user: User) -> list[Match]:
-    """Run full matching pipeline for a user and persist results."""
-    # Clear old matches
-    db.query(Match).filter(Match.source_user_id == user.id).delete()
-    db.commit()
 
+def match_investor_to_startups(
+    db: Session,
+    investor: InvestorProfile,
+    limit: int | None = 20,
+    corpus: MatchingCorpus | None = None,
+) -> list[dict]:
+    """Match one investor against every startup in a single vectorized pass.
+
+    Scores are the same thesis-alignment breakdown as match_startup_to_investors,
+    seen from the investor's side. A limit of None returns every startup above
+    the threshold.
+    """
+    startups = (corpus or MatchingCorpus(db)).startups
+    if not startups:
+        return []
+
+    industries = np.array([(s.industry or "").lower() for s in startups], dtype=object)
+    stages = np.array([(s.stage or "").lower() for s in startups], dtype=object)
+    funding = np.array([s.funding_ask or 0.0 for s in startups], dtype=np.float64)
+
+    sectors = [s.lower() for s in investor.preferred_sectors or []]
+    preferred_stages = [s.lower() for s in investor.preferred_stages or []]
+    sector_match = np.isin(industries, sectors) & (industries != "")
+    stage_match = np.isin(stages, preferred_stages) & (stages != "")
+    check_match = np.zeros(len(startups), dtype=bool)
+    if investor.check_size_min:
+        check_max = investor.check_size_max or float("inf")
+        check_match = (funding != 0) & (investor.check_size_min <= funding) & (funding <= check_max)
+
+    score = np.where(sector_match, 0.3, 0.0) + np.where(stage_match, 0.2, 0.0) + np.where(check_match, 0.1, 0.0)
+    semantic_scores = startup_index.scores(investor_index.get(investor.id), [s.id for s in startups])
+    overall = (0.6 * score) + (0.4 * semantic_scores)
+
+    ranked = np.where(overall > 0.05, np.round(overall, 3), -np.inf)
+    winners = top_k(ranked, len(startups) if limit is None else limit)
+
+    results = []
+    for i in winners:
+        if ranked[i] == -np.inf:
+            continue
+        results.append({
+            "startup_id": startups[i].id,
+            "founder_user_id": startups[i].founder_id,
+            "overall_score": round(float(overall[i]), 3),
+            "skill_overlap_score": round(float(score[i]), 3),
+            "semantic_score": round(float(semantic_scores[i]), 3),
+            "matched_skills": _thesis_reasons(sector_match[i], stage_match[i], check_match[i]),
+            "missing_skills": [],
+        })
+    return results
+
+
+def run_matching_for_user(db: Session, user: User, corpus: MatchingCorpus | None = None) -> list[Match]:
+    """Run full matching pipeline for a user and persist results.
+
+    All scoring shares one corpus, so a refresh issues a fixed number of queries.
+    Scoring and saving are timed as the matching.score and matching.save spans;
+    corpus queries show up separately as matching.load, inside matching.score.
+    """
+    corpus = corpus or MatchingCorpus(db)
+    with span("matching.score"):
+        new_matches = score_matches_for_user(db, user, corpus)
+    with span("matching.save"):
+        return save_matches(db, user.id, new_matches)
+
+
+def score_matches_for_user(db: Session, user: User, corpus: MatchingCorpus) -> list[dict]:
+    """Fresh match rows for a user, by role, as Match column values."""
     new_matches = []
 
     if user.role == UserRole.FOUNDER and user.startup:
         # Match talent to each requirement
         for req in user.startup.requirements:
-            for m in match_talent_to_requirement(db, req):
-                match = Match(
+            for m in match_talent_to_requirement(db, req, corpus=corpus):
+                match = dict(
                     source_user_id=user.id,
                     target_user_id=m["talent_user_id"],
                     match_type="talent_to_startup",
@@ -141,12 +227,11 @@ def run_matching_for_user(db: Session, user: User) -> list[Match]:
                     missing_skills=m["missing_skills"],
                     requirement_id=m["requirement_id"],
                 )
-                db.add(match)
                 new_matches.append(match)
 
         # Match to investors
-        for m in match_startup_to_investors(db, user.startup):
-            match = Match(
+        for m in match_startup_to_investors(db, user.startup, corpus=corpus):
+            match = dict(
                 source_user_id=user.id,
                 target_user_id=m["investor_user_id"],
                 match_type="startup_to_investor",
@@ -155,58 +240,114 @@ def run_matching_for_user(db: Session, user: User) -> list[Match]:
                 semantic_score=m["semantic_score"],
                 matched_skills=m["matched_skills"],
                 missing_skills=m["missing_skills"],
+                requirement_id=None,
             )
-            db.add(match)
             new_matches.append(match)
 
     elif user.role == UserRole.TALENT and user.talent_profile:
-        # Match against all active requirements
-        requirements = db.query(TalentRequirement).filter(TalentRequirement.is_active == 1).all()
-        for req in requirements:
-            candidate_skills = [s.name for s in user.talent_profile.skills]
-            skill_score, matched, missing = compute_skill_overlap(
-                req.required_skills or [], candidate_skills
+        # Match against active requirements: those sharing a skill, plus any whose
+        # semantic score alone can clear the 0.1 threshold (0.4 * semantic > 0.1)
+        profile = user.talent_profile
+        talent_bits = talent_skill_index.bits_of(profile.id)
+        query = talent_index.get(profile.id)
+        candidate_ids = set(requirement_skill_index.overlap_counts(talent_bits)[0].tolist())
+        candidate_ids.update(
+            req_id for req_id, _ in requirement_index.search(query, len(requirement_index), min_score=0.25 - 1e-6)
+        )
+        requirements = [r for r in corpus.requirements if r.is_active == 1 and r.id in candidate_ids]
+        requirement_ids = [r.id for r in requirements]
+        overlap, required_counts = requirement_skill_index.overlap(requirement_ids, talent_bits)
+        skill_scores = np.divide(
+            overlap, required_counts, out=np.zeros(len(requirements)), where=required_counts > 0,
+        )
+        semantic_scores = requirement_index.scores(query, requirement_ids)
+        overall = (0.6 * skill_scores) + (0.4 * semantic_scores)
+
+        for i in np.flatnonzero(overall > 0.1):
+            req = requirements[i]
+            matched, missing = skill_vocabulary.explain(requirement_skill_index.bits_of(req.id), talent_bits)
+            match = dict(
+                source_user_id=user.id,
+                target_user_id=req.founder_id or 0,
+                match_type="talent_to_startup",
+                overall_score=round(float(overall[i]), 3),
+                skill_overlap_score=round(float(skill_scores[i]), 3),
+                semantic_score=round(float(semantic_scores[i]), 3),
+                matched_skills=matched,
+                missing_skills=missing,
+                requirement_id=req.id,
             )
-            semantic_score = 0.0
-            if req.embedding and user.talent_profile.embedding:
-                semantic_score = cosine_similarity(req.embedding, user.talent_profile.embedding)
-            overall = (0.6 * skill_score) + (0.4 * semantic_score)
-
-            if overall > 0.1:
-                startup = db.query(Startup).filter(Startup.id == req.startup_id).first()
-                match = Match(
-                    source_user_id=user.id,
-                    target_user_id=startup.founder_id if startup else 0,
-                    match_type="talent_to_startup",
-                    overall_score=round(overall, 3),
-                    skill_overlap_score=round(skill_score, 3),
-                    semantic_score=round(semantic_score, 3),
-                    matched_skills=matched,
-                    missing_skills=missing,
-                    requirement_id=req.id,
-                )
-                db.add(match)
-                new_matches.append(match)
+            new_matches.append(match)
 
     elif user.role == UserRole.INVESTOR and user.investor_profile:
-        # Match against all startups
-        startups = db.query(Startup).all()
-        for startup in startups:
-            results = match_startup_to_investors(db, startup, limit=100)
-            for m in results:
-                if m["investor_user_id"] == user.id:
-                    match = Match(
-                        source_user_id=user.id,
-                        target_user_id=startup.founder_id,
-                        match_type="startup_to_investor",
-                        overall_score=m["overall_score"],
-                        skill_overlap_score=m["skill_overlap_score"],
-                        semantic_score=m["semantic_score"],
-                        matched_skills=m["matched_skills"],
-                        missing_skills=m["missing_skills"],
-                    )
-                    db.add(match)
-                    new_matches.append(match)
+        # Match against all startups from the investor's side
+        for m in match_investor_to_startups(db, user.investor_profile, limit=None, corpus=corpus):
+            match = dict(
+                source_user_id=user.id,
+                target_user_id=m["founder_user_id"],
+                match_type="startup_to_investor",
+                overall_score=m["overall_score"],
+                skill_overlap_score=m["skill_overlap_score"],
+                semantic_score=m["semantic_score"],
+                matched_skills=m["matched_skills"],
+                missing_skills=m["missing_skills"],
+                requirement_id=None,
+            )
+            new_matches.append(match)
 
-    db.commit()
     return new_matches
+
+
+MATCH_SCORE_FIELDS = ("overall_score", "skill_overlap_score", "semantic_score", "matched_skills", "missing_skills")
+MATCH_INSERT_FIELDS = ("source_user_id", "target_user_id", "match_type", "requirement_id") + MATCH_SCORE_FIELDS
+
+
+def _match_key(match: Match | dict) -> tuple:
+    if isinstance(match, dict):
+        return match["target_user_id"], match["match_type"], match["requirement_id"]
+    return match.target_user_id, match.match_type, match.requirement_id
+
+
+def save_matches(db: Session, source_user_id: int, matches: list[dict]) -> list[Match]:
+    """Replace a user's stored matches with fresh match rows in a single transaction.
+
+    Pairs that survive keep their row and Match.id, so ConnectionRequest.match_id
+    stays valid, and are only updated if a score changed. New pairs are inserted
+    with one executemany and stale pairs deleted. Readers never see an empty
+    result set. Returns the stored rows, in the order of matches.
+    """
+    existing = {}
+    stale = []
+    for current in db.query(Match).filter(Match.source_user_id == source_user_id):
+        if _match_key(current) in existing:
+            stale.append(current)
+        else:
+            existing[_match_key(current)] = current
+
+    inserts = []
+    for match in matches:
+        current = existing.pop(_match_key(match), None)
+        if current is None:
+            inserts.append({field: match[field] for field in MATCH_INSERT_FIELDS})
+            continue
+        for field in MATCH_SCORE_FIELDS:
+            value = match[field]
+            if getattr(current, field) != value:
+                setattr(current, field, value)
+
+    stale.extend(existing.values())
+    if stale:
+        stale_ids = [m.id for m in stale]
+        db.query(ConnectionRequest).filter(ConnectionRequest.match_id.in_(stale_ids)).update(
+            {ConnectionRequest.match_id: None}, synchronize_session=False
+        )
+        for m in stale:
+            db.delete(m)
+    db.flush()
+    if inserts:
+        # Core executemany: the ORM would issue one INSERT per row on SQLite
+        db.execute(insert(Match), inserts)
+    db.commit()
+    # Reload every saved row in one query instead of one refresh per expired object
+    stored = {_match_key(m): m for m in db.query(Match).filter(Match.source_user_id == source_user_id)}
+    return [stored[_match_key(match)] for match in matches]
@@ -0,0 +1,180 @@
+"""Skill bitset indexes for matching candidate generation and skill scoring.
+
+Each talent profile (or active requirement) is one row of packed uint64 skill
+bitsets (see app/services/skill_vocabulary.py). Overlap counts against every
+row come from a single vectorized popcount over the matrix, so the matching
+engine only scores entities that share at least one skill, without building
+per-pair name sets.
+"""
+import threading
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.models.startup import TalentRequirement
+from app.models.talent import TalentProfile, TalentSkill
+from app.models.types import SKILL_BITS_DTYPE
+from app.services.skill_vocabulary import intern_skills, load_skill_vocabulary, pad_bits
+
+
+class SkillIndex:
+    """ID -> skill bitset, as one uint64 matrix row per ID."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._bits = np.zeros((0, 1), dtype=SKILL_BITS_DTYPE)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._rows: dict[int, int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._rows
+
+    def load(self, items) -> None:
+        """Replace the whole index with (id, bitset) pairs."""
+        items = list(items)
+        words = max([len(bits) for _, bits in items if bits is not None], default=0) or 1
+        matrix = np.zeros((len(items), words), dtype=SKILL_BITS_DTYPE)
+        for row, (_, bits) in enumerate(items):
+            if bits is not None:
+                matrix[row, :len(bits)] = bits
+        ids = np.array([item_id for item_id, _ in items], dtype=np.int64)
+        with self._lock:
+            self._bits = matrix
+            self._ids = ids
+            self._rows = {int(item_id): row for row, item_id in enumerate(ids)}
+            self._size = len(ids)
+
+    def replace(self, item_id: int, bits: np.ndarray) -> None:
+        """Set the skills of item_id, dropping any it had before."""
+        with self._lock:
+            if len(bits) > self._bits.shape[1]:
+                self._widen(len(bits))
+            row = self._rows.get(item_id)
+            if row is None:
+                if self._size == self._bits.shape[0]:
+                    self._grow()
+                row = self._size
+                self._rows[item_id] = row
+                self._ids[row] = item_id
+                self._size += 1
+            self._bits[row] = pad_bits(bits, self._bits.shape[1])
+
+    def remove(self, item_id: int) -> None:
+        with self._lock:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                return
+            last = self._size - 1
+            if row != last:
+                moved_id = int(self._ids[last])
+                self._bits[row] = self._bits[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._bits[last] = 0
+            self._size = last
+
+    def bits_of(self, item_id: int) -> np.ndarray | None:
+        """A copy of the bitset of item_id, or None if it is not indexed."""
+        with self._lock:
+            row = self._rows.get(item_id)
+            return None if row is None else self._bits[row].copy()
+
+    def overlap_counts(self, bits: np.ndarray | None) -> tuple[np.ndarray, np.ndarray]:
+        """(ids, counts): how many of the skills in bits each ID holds, for IDs holding at least one."""
+        if bits is None or len(bits) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        with self._lock:
+            words = min(len(bits), self._bits.shape[1])
+            counts = np.bitwise_count(self._bits[:self._size, :words] & bits[:words]).sum(axis=1, dtype=np.int64)
+            hits = np.flatnonzero(counts)
+            return self._ids[hits], counts[hits]
+
+    def overlap(self, ids: list[int], bits: np.ndarray | None) -> tuple[np.ndarray, np.ndarray]:
+        """(overlap, sizes) for each of ids: skills shared with bits, and skills the ID has.
+
+        Unindexed IDs count as having no skills.
+        """
+        overlap = np.zeros(len(ids), dtype=np.int64)
+        sizes = np.zeros(len(ids), dtype=np.int64)
+        if len(ids) == 0:
+            return overlap, sizes
+        with self._lock:
+            rows = np.fromiter((self._rows.get(i, -1) for i in ids), dtype=np.intp, count=len(ids))
+            present = rows >= 0
+            matrix = self._bits[rows[present]]
+            query = pad_bits(bits, matrix.shape[1])
+        sizes[present] = np.bitwise_count(matrix).sum(axis=1, dtype=np.int64)
+        overlap[present] = np.bitwise_count(matrix & query).sum(axis=1, dtype=np.int64)
+        return overlap, sizes
+
+    def memory_bytes(self) -> int:
+        return self._bits.nbytes + self._ids.nbytes
+
+    def _grow(self) -> None:
+        capacity = max(16, self._bits.shape[0] * 2)
+        bits = np.zeros((capacity, self._bits.shape[1]), dtype=SKILL_BITS_DTYPE)
+        bits[:self._size] = self._bits[:self._size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._bits, self._ids = bits, ids
+
+    def _widen(self, words: int) -> None:
+        # The vocabulary outgrew the matrix; new skills get new columns
+        bits = np.zeros((self._bits.shape[0], words), dtype=SKILL_BITS_DTYPE)
+        bits[:, :self._bits.shape[1]] = self._bits
+        self._bits = bits
+
+
+talent_skill_index = SkillIndex("talent")
+requirement_skill_index = SkillIndex("requirement")
+
+
+def load_skill_indexes(db: Session) -> None:
+    """Load the vocabulary and build both skill indexes. Called once at startup.
+
+    Rows whose skill_bits were never computed (databases from before the
+    vocabulary, seed scripts) are encoded from their skill names, and the
+    bitsets are written back.
+    """
+    load_skill_vocabulary(db)
+
+    talents = dict(db.query(TalentProfile.id, TalentProfile.skill_bits))
+    stale = {profile_id for profile_id, bits in talents.items() if bits is None}
+    if stale:
+        names: dict[int, list[str]] = {profile_id: [] for profile_id in stale}
+        for profile_id, name in db.query(TalentSkill.profile_id, TalentSkill.name):
+            if profile_id in names:
+                names[profile_id].append(name)
+        _backfill(db, TalentProfile, talents, names)
+
+    requirements = {
+        req_id: (bits, skills, is_active)
+        for req_id, bits, skills, is_active in db.query(
+            TalentRequirement.id, TalentRequirement.skill_bits,
+            TalentRequirement.required_skills, TalentRequirement.is_active,
+        )
+    }
+    requirement_bits = {req_id: bits for req_id, (bits, _, _) in requirements.items()}
+    stale_requirements = {
+        req_id: skills or [] for req_id, (bits, skills, _) in requirements.items() if bits is None
+    }
+    if stale_requirements:
+        _backfill(db, TalentRequirement, requirement_bits, stale_requirements)
+
+    if stale or stale_requirements:
+        db.commit()
+    talent_skill_index.load(talents.items())
+    requirement_skill_index.load(
+        (req_id, requirement_bits[req_id]) for req_id, (_, _, is_active) in requirements.items() if is_active == 1
+    )
+
+
+def _backfill(db: Session, model, bits: dict[int, np.ndarray | None], names: dict[int, list[str]]) -> None:
+    intern_skills([name for skill_names in names.values() for name in skill_names], db)
+    for item_id, skill_names in names.items():
+        bits[item_id] = intern_skills(skill_names, db)
+    db.execute(update(model), [{"id": item_id, "skill_bits": bits[item_id]} for item_id in names])
@@ -0,0 +1,168 @@
+"""Canonical skill vocabulary: skill names and aliases interned to integer IDs.
+
+Every skill a talent lists or a requirement asks for is stored once in the
+``skills`` table, and ``skill_aliases`` folds other spellings into it
+("ReactJS", "react.js" -> React). A skill's ID is its bit position in the
+packed uint64 bitsets kept on talent profiles and requirements, so the
+overlap between two skill sets is the popcount of their AND, and names are
+only decoded for the matches that are actually returned.
+"""
+import threading
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.skill import Skill, SkillAlias
+from app.models.types import SKILL_BITS_DTYPE
+
+WORD_BITS = 64
+
+
+def normalize_skill(name: str) -> str:
+    """Lookup key for a skill name or alias: lowercase, single spaces."""
+    return " ".join(name.lower().split())
+
+
+def skill_count(bits: np.ndarray | None) -> int:
+    return 0 if bits is None else int(np.bitwise_count(bits).sum())
+
+
+def pad_bits(bits: np.ndarray | None, words: int) -> np.ndarray:
+    """bits as exactly `words` uint64 words (stored bitsets omit trailing zero words)."""
+    out = np.zeros(words, dtype=SKILL_BITS_DTYPE)
+    if bits is not None:
+        n = min(words, len(bits))
+        out[:n] = bits[:n]
+    return out
+
+
+class SkillVocabulary:
+    """In-memory copy of the skills and skill_aliases tables."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: dict[str, int] = {}  # normalized name or alias -> skill ID
+        self._names: dict[int, str] = {}  # skill ID -> canonical name
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def load(self, skills, aliases) -> None:
+        """Replace the vocabulary with (id, name, normalized) skills and (alias, skill_id) aliases."""
+        ids: dict[str, int] = {}
+        names: dict[int, str] = {}
+        for skill_id, name, normalized in skills:
+            ids[normalized] = skill_id
+            names[skill_id] = name
+        for alias, skill_id in aliases:
+            if skill_id in names:
+                ids.setdefault(alias, skill_id)
+        with self._lock:
+            self._ids = ids
+            self._names = names
+
+    def add(self, skills) -> None:
+        """Merge in (id, name, normalized) rows for newly interned skills."""
+        with self._lock:
+            for skill_id, name, normalized in skills:
+                self._ids[normalized] = skill_id
+                self._names[skill_id] = name
+
+    def lookup(self, name: str) -> int | None:
+        return self._ids.get(normalize_skill(name))
+
+    def unknown(self, names) -> dict[str, str]:
+        """Normalized key -> first spelling, for each of names not in the vocabulary."""
+        new: dict[str, str] = {}
+        for name in names:
+            key = normalize_skill(name)
+            if key and key not in self._ids:
+                new.setdefault(key, " ".join(name.split()))
+        return new
+
+    def encode(self, names) -> np.ndarray:
+        """Bitset of the given skill names. Names that were never interned are ignored."""
+        ids = [skill_id for skill_id in map(self.lookup, names) if skill_id is not None]
+        bits = np.zeros(max(ids) // WORD_BITS + 1 if ids else 0, dtype=SKILL_BITS_DTYPE)
+        for skill_id in ids:
+            bits[skill_id // WORD_BITS] |= np.uint64(1) << np.uint64(skill_id % WORD_BITS)
+        return bits
+
+    def decode(self, bits: np.ndarray | None) -> list[str]:
+        """Canonical names of the skills set in bits, sorted case-insensitively."""
+        if bits is None:
+            return []
+        names = self._names
+        found = []
+        # Bitsets hold a handful of skills, so walking set bits beats unpacking every word
+        for index, word in enumerate(bits.tolist()):
+            base = index * WORD_BITS
+            while word:
+                low = word & -word
+                name = names.get(base + low.bit_length() - 1)
+                if name is not None:
+                    found.append(name)
+                word ^= low
+        return sorted(found, key=str.casefold)
+
+    def explain(self, required: np.ndarray | None, candidate: np.ndarray | None) -> tuple[list[str], list[str]]:
+        """(matched, missing) skill names of a candidate against the required bitset."""
+        if required is None or len(required) == 0:
+            return [], []
+        candidate = pad_bits(candidate, len(required))
+        return self.decode(required & candidate), self.decode(required & ~candidate)
+
+
+skill_vocabulary = SkillVocabulary()
+
+
+def load_skill_vocabulary(db: Session) -> None:
+    skill_vocabulary.load(
+        db.execute(select(Skill.id, Skill.name, Skill.normalized)),
+        db.execute(select(SkillAlias.alias, SkillAlias.skill_id)),
+    )
+
+
+def intern_skills(names, db: Session | None = None) -> np.ndarray:
+    """Bitset of names, first adding any skills the vocabulary has not seen.
+
+    New skills are inserted and committed through db when given, or in a
+    short transaction of their own. That takes a write lock, so request
+    handlers call this before they start writing.
+    """
+    new = skill_vocabulary.unknown(names)
+    if new and db is not None:
+        _commit_skills(db, new)
+    elif new:
+        with SessionLocal() as session:
+            _commit_skills(session, new)
+    return skill_vocabulary.encode(names)
+
+
+def _commit_skills(db: Session, new: dict[str, str]) -> None:
+    """Insert and commit new skills. Their IDs only enter the vocabulary once committed.
+
+    An ID from a rolled-back insert can be handed out again to another name,
+    so it must never reach a bitset. A skill another process inserted in the
+    meantime is picked up instead of inserted twice.
+    """
+    for attempt in range(2):
+        try:
+            rows = db.execute(
+                select(Skill.id, Skill.name, Skill.normalized).where(Skill.normalized.in_(list(new)))
+            ).all()
+            found = {normalized for _, _, normalized in rows}
+            created = [Skill(name=name, normalized=key) for key, name in new.items() if key not in found]
+            db.add_all(created)
+            db.flush()
+            rows = list(rows) + [(s.id, s.name, s.normalized) for s in created]
+            db.commit()
+        except IntegrityError:
+            # Lost a race for one of the names; it exists now
+            db.rollback()
+            if attempt:
+                raise
+            continue
+        skill_vocabulary.add(rows)
+        return
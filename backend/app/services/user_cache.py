@@ -0,0 +1,89 @@
+"""Bounded TTL cache of verified bearer token -> user snapshot.
+
+Entries are detached User instances (optionally with their role profile
+loaded) that get_current_user merges into the request session without SQL.
+An entry lives until the shorter of the TTL and the token's own expiry, and
+routes that change a user or their profile drop it with ``invalidate``.
+The cache is per process, so with several workers the TTL bounds how long
+another worker can serve a stale snapshot.
+"""
+import threading
+import time
+from collections import OrderedDict
+from app.config import get_settings
+from app.models.user import User
+
+settings = get_settings()
+
+
+class UserCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[User, float]] = OrderedDict()
+        self._tokens: dict[int, set[str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> User | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    self._drop(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token: str, user: User, token_expires_at: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if token in self._entries:
+                self._drop(token)
+            self._entries[token] = (user, min(time.time() + self.ttl, token_expires_at))
+            self._tokens.setdefault(user.id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, user_id: int) -> None:
+        """Forget every cached token of a user, e.g. after their profile changed."""
+        with self._lock:
+            for token in self._tokens.pop(user_id, ()):
+                self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _drop(self, token: str) -> None:
+        user, _ = self._entries.pop(token)
+        tokens = self._tokens.get(user.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens[user.id]
+
+
+user_cache = UserCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
@@ -0,0 +1,222 @@
+"""In-memory embedding indexes for semantic matching.
+
+One exact cosine-similarity index per entity type, loaded from the database at
+startup and kept current by the profile write handlers, so matching never has
+to re-read and re-parse the embedding columns.
+"""
+import sys
+import threading
+from collections import Counter
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.startup import Startup, TalentRequirement
+from app.models.talent import TalentProfile
+from app.models.investor import InvestorProfile
+
+# Rows gathered per matrix product in VectorIndex.scores (~6 MB at 1536 dims)
+SCORE_CHUNK_ROWS = 1024
+
+
+def unit_vector(embedding: list[float] | np.ndarray | None) -> np.ndarray | None:
+    """Return the embedding as a unit-length float32 vector, or None if unusable."""
+    if embedding is None or len(embedding) == 0:
+        return None
+    vec = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else None
+
+
+def embedding_matrix(embeddings: list[list[float] | np.ndarray | None]) -> np.ndarray:
+    """Stack embeddings into a float32 matrix of unit-length rows.
+
+    Missing or zero embeddings become zero rows, so they score 0 against any query.
+    """
+    dim = next((len(e) for e in embeddings if e is not None and len(e)), 0)
+    matrix = np.zeros((len(embeddings), dim), dtype=np.float32)
+    for i, emb in enumerate(embeddings):
+        if emb is not None and len(emb):
+            matrix[i] = emb
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first. Ties keep their original order."""
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if n > k:
+        kth = scores[np.argpartition(scores, n - k)[n - k]]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
+
+
+class VectorIndex:
+    """Exact cosine-similarity index over unit-normalized float32 rows keyed by ID."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._rows: dict[int, int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._rows
+
+    @property
+    def dim(self) -> int:
+        return self._matrix.shape[1]
+
+    def load(self, items: list[tuple[int, list[float] | np.ndarray | None]]) -> None:
+        """Replace the whole index with (id, embedding) pairs.
+
+        If rows from different embedding providers are mixed, only the most common
+        dimension is kept; the others are left out until they are re-embedded.
+        """
+        items = [(item_id, emb) for item_id, emb in items if unit_vector(emb) is not None]
+        if items:
+            dims = Counter(len(emb) for _, emb in items)
+            dim = dims.most_common(1)[0][0]
+            items = [(item_id, emb) for item_id, emb in items if len(emb) == dim]
+        matrix = embedding_matrix([emb for _, emb in items])
+        ids = np.array([item_id for item_id, _ in items], dtype=np.int64)
+        with self._lock:
+            self._matrix = matrix
+            self._ids = ids
+            self._rows = {int(item_id): row for row, item_id in enumerate(ids)}
+            self._size = len(ids)
+
+    def upsert(self, item_id: int, embedding: list[float] | np.ndarray | None) -> None:
+        """Insert or replace the vector for item_id. A missing embedding removes it."""
+        vec = unit_vector(embedding)
+        if vec is None:
+            self.remove(item_id)
+            return
+        with self._lock:
+            if self._size == 0:
+                self._matrix = np.zeros((16, vec.shape[0]), dtype=np.float32)
+                self._ids = np.zeros(16, dtype=np.int64)
+            elif vec.shape[0] != self.dim:
+                raise ValueError(f"{self.name} index expects dimension {self.dim}, got {vec.shape[0]}")
+
+            row = self._rows.get(item_id)
+            if row is None:
+                if self._size == self._matrix.shape[0]:
+                    self._grow()
+                row = self._size
+                self._rows[item_id] = row
+                self._ids[row] = item_id
+                self._size += 1
+            self._matrix[row] = vec
+
+    def remove(self, item_id: int) -> None:
+        with self._lock:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                return
+            last = self._size - 1
+            if row != last:
+                moved_id = int(self._ids[last])
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._matrix[last] = 0
+            self._size = last
+
+    def get(self, item_id: int) -> np.ndarray | None:
+        """Return a copy of the stored unit vector, or None if item_id is not indexed."""
+        with self._lock:
+            row = self._rows.get(item_id)
+            return None if row is None else self._matrix[row].copy()
+
+    def scores(self, query: np.ndarray | None, ids: list[int]) -> np.ndarray:
+        """Cosine similarity of query against each of ids; unindexed ids score 0."""
+        out = np.zeros(len(ids))
+        if query is None or len(ids) == 0:
+            return out
+        with self._lock:
+            if self._size == 0 or query.shape[0] != self.dim:
+                return out
+            rows = np.fromiter((self._rows.get(i, -1) for i in ids), dtype=np.intp, count=len(ids))
+            positions = np.flatnonzero(rows >= 0)
+            wanted = rows[positions]
+            if 2 * len(wanted) >= self._size:
+                # Most of the index: one pass over the matrix, without copying rows
+                out[positions] = (self._matrix[:self._size] @ query)[wanted]
+                return out
+            # A few rows: gather them in bounded chunks rather than scanning everything
+            for start in range(0, len(wanted), SCORE_CHUNK_ROWS):
+                end = start + SCORE_CHUNK_ROWS
+                out[positions[start:end]] = self._matrix[wanted[start:end]] @ query
+        return out
+
+    def search(
+        self, query: np.ndarray | None, k: int, min_score: float | None = None,
+    ) -> list[tuple[int, float]]:
+        """Exact top-k (id, similarity) pairs for query, best first.
+
+        With min_score, only rows at least that similar are considered.
+        """
+        if query is None:
+            return []
+        with self._lock:
+            if self._size == 0 or query.shape[0] != self.dim:
+                return []
+            similarities = self._matrix[:self._size] @ query
+            ids = self._ids[:self._size].copy()
+        if min_score is not None:
+            keep = np.flatnonzero(similarities >= min_score)
+            similarities, ids = similarities[keep], ids[keep]
+        return [(int(ids[i]), float(similarities[i])) for i in top_k(similarities, k)]
+
+    def search_by_id(self, item_id: int, k: int) -> list[tuple[int, float]]:
+        """Exact top-k neighbours of an indexed item, excluding the item itself."""
+        hits = self.search(self.get(item_id), k + 1)
+        return [(i, s) for i, s in hits if i != item_id][:k]
+
+    def memory_bytes(self) -> int:
+        """Approximate resident size: vector storage, ID array and row lookup table."""
+        return self._matrix.nbytes + self._ids.nbytes + sys.getsizeof(self._rows)
+
+    def _grow(self) -> None:
+        capacity = max(16, self._matrix.shape[0] * 2)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._matrix, self._ids = matrix, ids
+
+
+talent_index = VectorIndex("talent")
+startup_index = VectorIndex("startup")
+requirement_index = VectorIndex("requirement")
+investor_index = VectorIndex("investor")
+
+_SOURCES = [
+    (talent_index, TalentProfile),
+    (startup_index, Startup),
+    (requirement_index, TalentRequirement),
+    (investor_index, InvestorProfile),
+]
+
+
+def load_indexes(db: Session) -> None:
+    """Build every index from the embedding columns. Called once at startup."""
+    for index, model in _SOURCES:
+        index.load(db.query(model.id, model.embedding).all())
+
+
+def index_stats() -> dict:
+    return {
+        index.name: {"size": len(index), "dim": index.dim, "memory_bytes": index.memory_bytes()}
+        for index, _ in _SOURCES
+    }
@@ -0,0 +1,123 @@
+"""Embed every row that is still missing an embedding.
+
+Rows created while no API key was configured keep a NULL embedding, which
+semantic matching treats as 0, and rows whose background embedding failed
+stay embedding_pending with their previous vector. This streams those rows
+in ID order, embeds them in parallel batches and writes the vectors back with
+bulk updates.
+
+    python backfill_embeddings.py [--batch-size 256] [--workers 4] [--only talent startup ...] [--all]
+
+Use --all to re-embed every row, e.g. after changing EMBEDDING_PROVIDER.
+
+The API keeps its embedding indexes in memory, so restart it afterwards to
+pick up the new vectors.
+"""
+import argparse
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from sqlalchemy import func, or_, true, update
+from sqlalchemy.orm import selectinload
+from app.database import SessionLocal
+from app.models.startup import Startup, TalentRequirement
+from app.models.talent import TalentProfile
+from app.models.investor import InvestorProfile
+from app.services.embedding_providers import get_provider
+from app.services.embeddings import (
+    get_embeddings, build_talent_text, build_startup_text, build_requirement_text, build_investor_text,
+)
+
+TARGETS = {
+    "talent": (TalentProfile, build_talent_text, [selectinload(TalentProfile.skills)]),
+    "startup": (Startup, build_startup_text, []),
+    "requirement": (TalentRequirement, build_requirement_text, []),
+    "investor": (InvestorProfile, build_investor_text, []),
+}
+
+
+def _embed(ids: list[int], texts: list[str]) -> list[dict]:
+    return [
+        {"id": row_id, "embedding": embedding, "embedding_pending": 0}
+        for row_id, embedding in zip(ids, get_embeddings(texts))
+        if embedding is not None
+    ]
+
+
+def backfill(db, name: str, batch_size: int, workers: int, everything: bool = False) -> tuple[int, int]:
+    """Backfill one model. Returns (rows embedded, rows still missing)."""
+    model, build_text, options = TARGETS[name]
+    missing = true() if everything else or_(model.embedding.is_(None), model.embedding_pending == 1)
+    total = db.query(func.count(model.id)).filter(missing).scalar()
+    if not total:
+        print(f"{name}: nothing to backfill")
+        return 0, 0
+
+    embedded = 0
+    seen = 0
+    last_id = 0
+    started = time.perf_counter()
+
+    def write(done):
+        nonlocal embedded
+        for future in done:
+            rows = future.result()
+            if rows:
+                db.execute(update(model), rows)
+                db.commit()
+            embedded += len(rows)
+        elapsed = time.perf_counter() - started
+        print(f"{name}: {embedded}/{total} embedded, {seen} scanned ({embedded / elapsed:.1f} rows/s)")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            rows = (
+                db.query(model)
+                .options(*options)
+                .filter(missing, model.id > last_id)
+                .order_by(model.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+            seen += len(rows)
+            pending.add(pool.submit(_embed, [r.id for r in rows], [build_text(r) for r in rows]))
+            db.expunge_all()
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write(done)
+        if pending:
+            write(wait(pending).done)
+
+    return embedded, total - embedded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=256, help="rows per embeddings request")
+    parser.add_argument("--workers", type=int, default=4, help="batches embedded in parallel")
+    parser.add_argument("--only", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--all", action="store_true", help="re-embed rows that already have an embedding")
+    args = parser.parse_args()
+
+    if not get_provider().available:
+        raise SystemExit("The embedding provider is not configured (is OPENAI_API_KEY set?); nothing can be embedded.")
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    embedded = failed = 0
+    try:
+        for name in args.only:
+            done, left = backfill(db, name, args.batch_size, args.workers, everything=args.all)
+            embedded += done
+            failed += left
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+    print(f"Embedded {embedded} rows in {elapsed:.1f}s ({embedded / max(elapsed, 1e-9):.1f} rows/s); {failed} still missing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Reader/writer throughput on SQLite, with and without the engine tuning.
+
+Reader threads run the match-results query while writer threads replace a
+user's matches in one transaction, as POST /api/matching/refresh does. Each
+configuration gets a fresh database file with identical data:
+
+- ``default``: plain create_engine (rollback journal, default pragmas)
+- ``tuned``: the pragmas from the settings (WAL, synchronous=NORMAL, ...)
+
+    python bench_db_concurrency.py [--seconds 5] [--readers 8] [--writers 2] [--json out.json]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.exc import OperationalError
+from app.database import Base, apply_sqlite_pragmas, engine_options, sqlite_pragmas
+from app.models import Match
+
+USERS = 200
+MATCHES_PER_USER = 50
+
+
+def _rows(user_id: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "source_user_id": user_id,
+            "target_user_id": rng.randrange(1, USERS * 5),
+            "match_type": "talent_to_startup",
+            "overall_score": round(rng.random(), 3),
+            "skill_overlap_score": rng.random(),
+            "semantic_score": rng.random(),
+            "matched_skills": ["python", "react"],
+            "missing_skills": ["go"],
+        }
+        for _ in range(MATCHES_PER_USER)
+    ]
+
+
+def build_engine(path: str, tuned: bool):
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, **engine_options(url))
+    if tuned:
+        apply_sqlite_pragmas(engine, sqlite_pragmas())
+    Base.metadata.create_all(engine)
+    rng = random.Random(0)
+    with engine.begin() as conn:
+        for user_id in range(1, USERS + 1):
+            conn.execute(insert(Match), _rows(user_id, rng))
+    return engine
+
+
+def run(engine, seconds: float, readers: int, writers: int) -> dict:
+    counts = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0}
+    latencies = {"reads": [], "writes": []}
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def results(user_id: int):
+        return (
+            select(Match.id, Match.target_user_id, Match.overall_score, Match.matched_skills)
+            .where(Match.source_user_id == user_id)
+            .order_by(Match.overall_score.desc(), Match.id).limit(100)
+        )
+
+    def reader(seed: int):
+        rng = random.Random(seed)
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(results(rng.randrange(1, USERS + 1))).all()
+                kind = "reads"
+            except OperationalError:
+                kind = "read_errors"
+            with lock:
+                counts[kind] += 1
+                if kind == "reads":
+                    latencies["reads"].append(time.perf_counter() - started)
+
+    def writer(seed: int):
+        rng = random.Random(seed)
+        while time.perf_counter() < stop:
+            user_id = rng.randrange(1, USERS + 1)
+            started = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(delete(Match).where(Match.source_user_id == user_id))
+                    conn.execute(insert(Match), _rows(user_id, rng))
+                kind = "writes"
+            except OperationalError:
+                kind = "write_errors"
+            with lock:
+                counts[kind] += 1
+                if kind == "writes":
+                    latencies["writes"].append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(1000 + i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = {
+        "reads_per_s": counts["reads"] / seconds,
+        "writes_per_s": counts["writes"] / seconds,
+        "read_errors": counts["read_errors"],
+        "write_errors": counts["write_errors"],
+    }
+    for kind, values in latencies.items():
+        values.sort()
+        report[f"{kind}_p95_ms"] = values[int(len(values) * 0.95)] * 1000 if values else None
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    reports = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, tuned in (("default", False), ("tuned", True)):
+            engine = build_engine(os.path.join(tmp, f"{name}.db"), tuned)
+            try:
+                reports[name] = run(engine, args.seconds, args.readers, args.writers)
+            finally:
+                engine.dispose()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:g}s per configuration")
+    print(f"{'':8} {'reads/s':>10} {'writes/s':>10} {'read p95':>10} {'write p95':>10} {'errors':>8}")
+    for name, r in reports.items():
+        errors = r["read_errors"] + r["write_errors"]
+        print(
+            f"{name:8} {r['reads_per_s']:10.1f} {r['writes_per_s']:10.1f} "
+            f"{_ms(r['reads_p95_ms']):>10} {_ms(r['writes_p95_ms']):>10} {errors:8d}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": reports}, f, indent=2)
+
+
+def _ms(value: float | None) -> str:
+    return f"{value:.1f}ms" if value is not None else "-"
+
+
+if __name__ == "__main__":
+    main()
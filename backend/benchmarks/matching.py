@@ -0,0 +1,231 @@
+"""Matching-engine benchmarks on synthetic data, checked against a JSON baseline.
+
+For each scale (users per role) a fresh SQLite database is generated and the
+in-memory indexes are loaded, then each case runs against --repeat different
+subjects. Each case records:
+
+- best, median and worst wall time (regressions are judged on the best,
+  which is the least disturbed by other load on the machine),
+- SQL statements per call,
+- peak Python/numpy memory of one extra traced call (tracemalloc slows a call
+  down, so it is kept apart from the timed ones).
+
+Cases:
+- match_talent_to_requirement, match_startup_to_investors: one call each, as
+  the engine is called without a shared corpus;
+- refresh_founder, refresh_talent, refresh_investor: run_matching_for_user
+  for each role branch, including saving the matches, as POST
+  /api/matching/refresh does.
+
+    python -m benchmarks.matching --scales 1000 10000 100000
+    python -m benchmarks.matching --scales 1000 10000 --update-baseline
+
+A run fails (exit status 1) when a case is slower or uses more memory than
+the baseline by more than the tolerance, or issues more queries.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from app.database import apply_sqlite_pragmas, engine_options, sqlite_pragmas
+from app.models.user import User
+from app.models.startup import Startup, TalentRequirement
+from app.services.matching_engine import (
+    match_startup_to_investors, match_talent_to_requirement, run_matching_for_user,
+)
+from app.services.skill_index import load_skill_indexes
+from app.services.vector_index import index_stats, load_indexes
+from benchmarks.synthetic import generate
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Differences below this are timer noise, whatever the ratio
+MIN_TIME_DELTA_MS = 2.0
+
+
+def _talent_to_requirement(session: Session, requirement_id: int) -> None:
+    match_talent_to_requirement(session, session.get(TalentRequirement, requirement_id))
+
+
+def _startup_to_investors(session: Session, startup_id: int) -> None:
+    match_startup_to_investors(session, session.get(Startup, startup_id))
+
+
+def _refresh(session: Session, user_id: int) -> None:
+    run_matching_for_user(session, session.get(User, user_id))
+
+
+def cases(n: int, requirements: int) -> dict[str, tuple[Callable[[Session, int], None], int, int]]:
+    """Case name -> (function, first subject ID, number of subjects)."""
+    return {
+        "match_talent_to_requirement": (_talent_to_requirement, 1, requirements),
+        "match_startup_to_investors": (_startup_to_investors, 1, n),
+        "refresh_founder": (_refresh, 1, n),
+        "refresh_talent": (_refresh, n + 1, n),
+        "refresh_investor": (_refresh, 2 * n + 1, n),
+    }
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+
+def run_scale(n: int, repeat: int, seed: int, dim: int, tmp: str) -> dict:
+    url = f"sqlite:///{os.path.join(tmp, f'bench_{n}.db')}"
+    engine = create_engine(url, **engine_options(url))
+    apply_sqlite_pragmas(engine, sqlite_pragmas())
+    try:
+        started = time.perf_counter()
+        counts = generate(engine, n, seed=seed, dim=dim)
+        generate_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with Session(engine) as session:
+            load_indexes(session)
+            load_skill_indexes(session)
+        load_s = time.perf_counter() - started
+
+        counter = QueryCounter(engine)
+        rng = np.random.default_rng(seed)
+        results = {}
+        for name, (fn, first_id, count) in cases(n, counts["requirements"]).items():
+            subjects = (first_id + rng.choice(count, size=min(repeat + 1, count), replace=False)).tolist()
+            times, queries = [], []
+            for subject in subjects[:-1]:
+                counter.count = 0
+                started = time.perf_counter()
+                with Session(engine) as session:
+                    fn(session, subject)
+                times.append((time.perf_counter() - started) * 1000)
+                queries.append(counter.count)
+
+            tracemalloc.start()
+            with Session(engine) as session:
+                fn(session, subjects[-1])
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results[name] = {
+                "wall_ms_min": round(min(times), 3),
+                "wall_ms_median": round(statistics.median(times), 3),
+                "wall_ms_max": round(max(times), 3),
+                "queries": max(queries),
+                "peak_memory_mb": round(peak / 2**20, 3),
+            }
+            print(f"  {name:30} {results[name]['wall_ms_min']:10.2f}ms {results[name]['queries']:4d} queries "
+                  f"{results[name]['peak_memory_mb']:9.2f}MB", flush=True)
+    finally:
+        engine.dispose()
+
+    return {
+        "rows": counts,
+        "setup": {
+            "generate_s": round(generate_s, 3),
+            "load_indexes_s": round(load_s, 3),
+            "index_memory_mb": round(sum(s["memory_bytes"] for s in index_stats().values()) / 2**20, 3),
+        },
+        "cases": results,
+    }
+
+
+def compare(results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float) -> list[str]:
+    """Regressions of results against the baseline, as readable lines."""
+    regressions = []
+    for scale, current in results.items():
+        base_cases = baseline.get("results", {}).get(scale, {}).get("cases", {})
+        for name, now in current["cases"].items():
+            base = base_cases.get(name)
+            if base is None:
+                continue
+            label = f"{scale}/{name}"
+            limit = base["wall_ms_min"] * (1 + time_tolerance)
+            if now["wall_ms_min"] > limit and now["wall_ms_min"] - base["wall_ms_min"] > MIN_TIME_DELTA_MS:
+                regressions.append(f"{label}: {now['wall_ms_min']:.2f}ms vs baseline {base['wall_ms_min']:.2f}ms")
+            if now["queries"] > base["queries"]:
+                regressions.append(f"{label}: {now['queries']} queries vs baseline {base['queries']}")
+            if now["peak_memory_mb"] > base["peak_memory_mb"] * (1 + memory_tolerance):
+                regressions.append(
+                    f"{label}: peak {now['peak_memory_mb']:.2f}MB vs baseline {base['peak_memory_mb']:.2f}MB"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000, 100000], help="users per role")
+    parser.add_argument("--repeat", type=int, default=3, help="timed calls per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dim", type=int, default=128, help="embedding dimensions")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed slowdown, as a fraction")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="allowed peak-memory growth")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    config = {"seed": args.seed, "dim": args.dim, "repeat": args.repeat}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.scales:
+            print(f"{n} users per role", flush=True)
+            results[str(n)] = run_scale(n, args.repeat, args.seed, args.dim, tmp)
+
+    report = {
+        "config": config,
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {"results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        # Keep scales this run did not cover
+        report["results"] = {**baseline.get("results", {}), **results}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"Warning: baseline was recorded with {baseline.get('config')}, this run used {config}")
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if regressions:
+        print("Regressions against the baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
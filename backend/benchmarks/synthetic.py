@@ -0,0 +1,162 @@
+"""Reproducible synthetic data for the matching benchmarks.
+
+``generate(engine, n)`` inserts n founders (each with a startup and one to
+three talent requirements), n talents and n investors. Skills, industries and
+stages come from the seed vocabulary, with skills drawn from a Zipf-like
+distribution so that a few (Python, React, ...) are common and the rest rare,
+as on the live platform. Every profile gets a random unit-vector embedding.
+The same seed always produces the same rows.
+"""
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from app.database import Base
+from app.models.user import User, UserRole
+from app.models.startup import Startup, TalentRequirement
+from app.models.talent import TalentProfile, TalentSkill
+from app.models.investor import InvestorProfile
+
+# The vocabulary seed.py uses, most popular first
+SKILLS = [
+    "Python", "React", "JavaScript", "SQL", "PostgreSQL", "REST API", "Docker", "AWS",
+    "Figma", "Data Science", "TensorFlow", "User Research", "Prototyping", "NLP",
+    "Tailwind CSS", "PyTorch", "Adobe XD", "MLOps",
+]
+INDUSTRIES = ["fintech", "edtech", "healthtech", "saas", "agritech"]
+STAGES = ["idea", "mvp", "early_traction", "growth"]
+INVESTOR_TYPES = ["angel", "vc", "diaspora", "institutional"]
+ENGAGEMENTS = ["full_time", "part_time", "contract", "internship"]
+PROFICIENCIES = ["beginner", "intermediate", "advanced", "expert"]
+FUNDING_ASKS = [5000, 10000, 25000, 50000, 100000, 250000]
+
+# A stored password hash is never checked by the benchmarks; skip bcrypt
+PASSWORD_HASH = "$2b$12$" + "x" * 53
+BATCH_SIZE = 10000
+
+
+def skill_weights(skew: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, len(SKILLS) + 1) ** skew
+    return weights / weights.sum()
+
+
+def random_embeddings(rng: np.random.Generator, count: int, dim: int) -> np.ndarray:
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _pick(rng: np.random.Generator, options: list, count: int, p=None) -> list:
+    return [options[i] for i in rng.choice(len(options), size=count, replace=False, p=p)]
+
+
+def _insert(conn, model, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+
+def generate(engine: Engine, n: int, seed: int = 0, dim: int = 128) -> dict:
+    """Create the schema and insert n users per role. Returns the row counts.
+
+    IDs are assigned here: founders are users 1..n, talents n+1..2n and
+    investors 2n+1..3n; startup, talent profile and investor profile i belong
+    to the i-th user of their role.
+    """
+    rng = np.random.default_rng(seed)
+    weights = skill_weights()
+    Base.metadata.create_all(engine)
+
+    users = [
+        {
+            "id": offset + i,
+            "email": f"{role.value}{i}@bench.example.com",
+            "hashed_password": PASSWORD_HASH,
+            "full_name": f"{role.value.title()} {i}",
+            "role": role,
+        }
+        for offset, role in ((0, UserRole.FOUNDER), (n, UserRole.TALENT), (2 * n, UserRole.INVESTOR))
+        for i in range(1, n + 1)
+    ]
+
+    startup_vectors = random_embeddings(rng, n, dim)
+    startups = [
+        {
+            "id": i,
+            "founder_id": i,
+            "name": f"Startup {i}",
+            "industry": INDUSTRIES[rng.integers(len(INDUSTRIES))],
+            "stage": STAGES[rng.integers(len(STAGES))],
+            "funding_ask": FUNDING_ASKS[rng.integers(len(FUNDING_ASKS))],
+            "team_size": int(rng.integers(1, 12)),
+            "embedding": startup_vectors[i - 1],
+        }
+        for i in range(1, n + 1)
+    ]
+
+    requirement_counts = rng.integers(1, 4, size=n)
+    requirement_vectors = random_embeddings(rng, int(requirement_counts.sum()), dim)
+    requirements = []
+    for startup_id, count in enumerate(requirement_counts, start=1):
+        for _ in range(count):
+            required = _pick(rng, SKILLS, int(rng.integers(2, 6)), weights)
+            requirements.append({
+                "id": len(requirements) + 1,
+                "startup_id": startup_id,
+                "title": f"{required[0]} role",
+                "required_skills": required,
+                "nice_to_have_skills": _pick(rng, SKILLS, int(rng.integers(0, 3)), weights),
+                "engagement_type": ENGAGEMENTS[rng.integers(len(ENGAGEMENTS))],
+                "is_active": int(rng.random() < 0.9),
+                "embedding": requirement_vectors[len(requirements)],
+            })
+
+    talent_vectors = random_embeddings(rng, n, dim)
+    talents = []
+    skills = []
+    for i in range(1, n + 1):
+        talents.append({
+            "id": i,
+            "user_id": n + i,
+            "engagement_preference": ENGAGEMENTS[rng.integers(len(ENGAGEMENTS))],
+            "embedding": talent_vectors[i - 1],
+        })
+        for name in _pick(rng, SKILLS, int(rng.integers(2, 7)), weights):
+            skills.append({
+                "profile_id": i,
+                "name": name,
+                "proficiency": PROFICIENCIES[rng.integers(len(PROFICIENCIES))],
+                "years_experience": float(rng.integers(0, 10)),
+            })
+
+    investor_vectors = random_embeddings(rng, n, dim)
+    investors = []
+    for i in range(1, n + 1):
+        check_min = FUNDING_ASKS[rng.integers(len(FUNDING_ASKS) - 1)]
+        investors.append({
+            "id": i,
+            "user_id": 2 * n + i,
+            "investor_type": INVESTOR_TYPES[rng.integers(len(INVESTOR_TYPES))],
+            "preferred_sectors": _pick(rng, INDUSTRIES, int(rng.integers(1, 4))),
+            "preferred_stages": _pick(rng, STAGES, int(rng.integers(1, 3))),
+            "check_size_min": check_min,
+            "check_size_max": check_min * 10,
+            "embedding": investor_vectors[i - 1],
+        })
+
+    with engine.begin() as conn:
+        for model, rows in (
+            (User, users),
+            (Startup, startups),
+            (TalentRequirement, requirements),
+            (TalentProfile, talents),
+            (TalentSkill, skills),
+            (InvestorProfile, investors),
+        ):
+            _insert(conn, model, rows)
+
+    return {
+        "users": len(users),
+        "startups": len(startups),
+        "requirements": len(requirements),
+        "talents": len(talents),
+        "talent_skills": len(skills),
+        "investors": len(investors),
+    }
@@ -0,0 +1,113 @@
+"""Check that SQLite plans every hot-path query with an index.
+
+Builds a scratch SQLite database migrated to the latest Alembic revision,
+runs EXPLAIN QUERY PLAN on the query each route issues and fails if the
+expected index is not used, if a table is scanned in full, or if a query
+that should read rows in index order needs a separate sort.
+
+    python check_query_plans.py
+"""
+import os
+import re
+import sys
+import tempfile
+
+_scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_scratch.close()
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch.name}"
+
+from sqlalchemy import and_, or_  # noqa: E402
+from app.database import SessionLocal, init_db  # noqa: E402
+from app.models import User, Startup, TalentRequirement, TalentProfile, TalentSkill, Match, ConnectionRequest  # noqa: E402
+
+
+def route_queries(db):
+    """(route, query, expected index or indexes, needs index order) for every hot-path query."""
+    results = db.query(Match).filter(Match.source_user_id == 1)
+    return [
+        ("GET /api/matching/results",
+         results.order_by(Match.overall_score.desc(), Match.id).limit(101),
+         "ix_matches_source_user_score", True),
+        ("GET /api/matching/results?cursor=",
+         results.filter(or_(Match.overall_score < 0.5, and_(Match.overall_score == 0.5, Match.id > 10)))
+         .order_by(Match.overall_score.desc(), Match.id).limit(101),
+         "ix_matches_source_user_score", True),
+        ("POST /api/matching/refresh (stored matches)",
+         results, "ix_matches_source_user_score", False),
+        ("POST /api/matching/refresh (stale connection links)",
+         db.query(ConnectionRequest.id).filter(ConnectionRequest.match_id.in_([1, 2, 3])),
+         "ix_connection_requests_match_id", False),
+        ("POST /api/matching/connect (pending check)",
+         db.query(ConnectionRequest).filter(
+             ConnectionRequest.from_user_id == 1,
+             ConnectionRequest.to_user_id == 2,
+             ConnectionRequest.status == "pending",
+         ),
+         "ix_connection_requests_from_to_status", False),
+        ("GET /api/matching/connections",
+         db.query(ConnectionRequest).filter(
+             (ConnectionRequest.from_user_id == 1) | (ConnectionRequest.to_user_id == 1)
+         ).order_by(ConnectionRequest.id).limit(101),
+         ("ix_connection_requests_from_to_status", "ix_connection_requests_to_user_id"), False),
+        ("GET /api/startups/requirements/all",
+         db.query(TalentRequirement).filter(TalentRequirement.is_active == 1, TalentRequirement.id > 10)
+         .order_by(TalentRequirement.id).limit(101),
+         "ix_talent_requirements_active", True),
+        ("GET /api/startups/requirements",
+         db.query(TalentRequirement).filter(TalentRequirement.startup_id == 1),
+         "ix_talent_requirements_startup_id", False),
+        ("GET /api/talent/me (skills)",
+         db.query(TalentSkill).filter(TalentSkill.profile_id == 1),
+         "ix_talent_skills_profile_id", False),
+        ("GET /api/matching/results (enrichment)",
+         db.query(User.id, User.full_name, User.role, Startup.name)
+         .outerjoin(Startup, Startup.founder_id == User.id)
+         .filter(User.id.in_([1, 2, 3])),
+         "sqlite_autoindex_startups_1", False),
+        ("GET /api/talent/me (profile)",
+         db.query(TalentProfile).filter(TalentProfile.user_id == 1),
+         "sqlite_autoindex_talent_profiles_1", False),
+    ]
+
+
+def explain(db, query) -> list[str]:
+    sql = str(query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def problems(plan: list[str], indexes: str | tuple[str, ...], ordered: bool) -> list[str]:
+    if isinstance(indexes, str):
+        indexes = (indexes,)
+    found = [
+        f"does not use {index}" for index in indexes
+        if not any(re.search(rf"\b{index}\b", step) for step in plan)
+    ]
+    found += [f"full scan: {step}" for step in plan if step.startswith("SCAN") and "USING" not in step]
+    if ordered:
+        found += [f"extra sort: {step}" for step in plan if "TEMP B-TREE" in step]
+    return found
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    failed = 0
+    try:
+        for route, query, indexes, ordered in route_queries(db):
+            plan = explain(db, query)
+            issues = problems(plan, indexes, ordered)
+            status = "FAIL" if issues else "ok"
+            print(f"{status:4}  {route}: {'; '.join(plan)}")
+            for issue in issues:
+                print(f"      - {issue}")
+            failed += bool(issues)
+    finally:
+        db.close()
+        os.unlink(_scratch.name)
+    if failed:
+        sys.exit(f"{failed} queries are not using their index")
+    print("All hot-path queries use their indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""A local stand-in for the OpenAI API, with configurable latency and errors.
+
+Serves the two endpoints the app uses, ``/v1/embeddings`` (vectors from the
+hashing provider) and ``/v1/chat/completions`` (the mock pitch feedback or
+team-gap analysis, optionally streamed), so timeouts, retries and the circuit
+breaker can be exercised offline:
+
+    python fake_upstream.py --latency 0.5 --error-rate 0.3
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8100/v1 uvicorn app.main:app
+
+The behaviour can be changed while it runs, e.g. to simulate an outage:
+
+    curl -X POST localhost:8100/fake/config -H 'content-type: application/json' -d '{"error_rate": 1}'
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.services.ai_copilot import PITCH_PROMPT, _mock_pitch_feedback, mock_team_gaps
+from app.services.embedding_providers import HashingEmbeddingProvider
+
+EMBEDDING_DIM = 1536  # the size text-embedding-3-small returns
+
+app = FastAPI(title="Fake OpenAI upstream")
+config = {"latency": 0.0, "jitter": 0.0, "error_rate": 0.0, "error_status": 503, "chunk_delay": 0.02}
+embedder = HashingEmbeddingProvider(EMBEDDING_DIM)
+requests_seen = {"embeddings": 0, "chat": 0, "errors": 0}
+
+
+async def _delay_or_error(kind: str) -> JSONResponse | None:
+    requests_seen[kind] += 1
+    await asyncio.sleep(config["latency"] + random.uniform(0, config["jitter"]))
+    if random.random() < config["error_rate"]:
+        requests_seen["errors"] += 1
+        return JSONResponse(
+            {"error": {"message": "fake upstream error", "type": "server_error"}},
+            status_code=config["error_status"],
+        )
+    return None
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    if error := await _delay_or_error("embeddings"):
+        return error
+    body = await request.json()
+    texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    vectors = embedder.embed(texts)
+    return {
+        "object": "list",
+        "model": body["model"],
+        "data": [
+            {"object": "embedding", "index": i, "embedding": vector or [0.0] * EMBEDDING_DIM}
+            for i, vector in enumerate(vectors)
+        ],
+        "usage": {"prompt_tokens": 0, "total_tokens": 0},
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    if error := await _delay_or_error("chat"):
+        return error
+    body = await request.json()
+    system = body["messages"][0]["content"]
+    content = json.dumps(_mock_pitch_feedback() if system == PITCH_PROMPT else mock_team_gaps())
+    completion = {"id": "fake", "created": int(time.time()), "model": body["model"]}
+
+    if not body.get("stream"):
+        return {
+            **completion,
+            "object": "chat.completion",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+        }
+
+    async def events():
+        for start in range(0, len(content), 16):
+            chunk = {
+                **completion,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": content[start:start + 16]}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(config["chunk_delay"])
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/fake/config")
+def get_config():
+    return {"config": config, "requests": requests_seen}
+
+
+@app.post("/fake/config")
+async def set_config(request: Request):
+    changes = await request.json()
+    unknown = set(changes) - set(config)
+    if unknown:
+        return JSONResponse({"detail": f"Unknown settings: {sorted(unknown)}"}, status_code=400)
+    config.update(changes)
+    return {"config": config, "requests": requests_seen}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra random seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="seconds between streamed chunks")
+    args = parser.parse_args()
+    config.update(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        error_status=args.error_status, chunk_delay=args.chunk_delay,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
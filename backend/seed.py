@@ -1,12 +1,12 @@
 """Seed the database with sample data for development."""
-from app.database import SessionLocal, engine, Base
+from app.database import SessionLocal, init_db
 from app.models.user import User, UserRole
 from app.models.startup import Startup, TalentRequirement
 from app.models.talent import TalentProfile, TalentSkill
 from app.models.investor import InvestorProfile
 from app.auth import hash_password
 
-Base.metadata.create_all(bind=engine)
+init_db()
 db = SessionLocal()
 
 # Clear existing data
@@ -0,0 +1,85 @@
+"""Shared test setup: the app on a throwaway SQLite database, with offline embeddings.
+
+Settings are read when app modules are imported, so the environment is fixed
+here before anything from app is imported.
+"""
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+TEST_DIR = tempfile.mkdtemp(prefix="neplaunch-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DIR}/test.db"
+os.environ["EMBEDDING_PROVIDER"] = "hashing"
+os.environ["EMBEDDING_CACHE_PATH"] = ":memory:"
+os.environ["LLM_CACHE_PATH"] = ":memory:"
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["DEBUG"] = "true"  # X-DB-Queries on every response
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+from app.metrics import DB_QUERIES_HEADER  # noqa: E402
+
+# Most SQL statements each hot endpoint may run, counting a cold auth cache (one
+# user lookup). Lower an entry when an endpoint gets cheaper; raising one needs a reason.
+QUERY_BUDGETS = {
+    "GET /api/auth/me": 1,
+    "GET /api/startups": 1,
+    "GET /api/startups/me": 1,
+    "GET /api/startups/requirements": 2,
+    "GET /api/startups/requirements/all": 1,
+    "GET /api/talent/me": 1,
+    "GET /api/investors/me": 1,
+    "GET /api/matching/results": 3,
+    "GET /api/matching/connections": 2,
+    "POST /api/matching/refresh": 11,  # founders: requirements, talent and investors
+}
+
+_emails = itertools.count(1)
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def register(client):
+    """Register a user with the given role; returns (user ID, auth headers)."""
+    def _register(role: str, full_name: str = "Test User") -> tuple[int, dict]:
+        response = client.post("/api/auth/register", json={
+            "email": f"user{next(_emails)}@example.com",
+            "password": "secret",
+            "full_name": full_name,
+            "role": role,
+        })
+        assert response.status_code == 200, response.text
+        body = response.json()
+        return body["user"]["id"], {"Authorization": f"Bearer {body['access_token']}"}
+    return _register
+
+
+def query_count(response) -> int:
+    """SQL statements the request ran, from the X-DB-Queries debug header."""
+    return int(response.headers[DB_QUERIES_HEADER])
+
+
+@pytest.fixture
+def query_budget():
+    """Check that a response succeeded within its endpoint's entry in QUERY_BUDGETS."""
+    def check(response) -> None:
+        endpoint = f"{response.request.method} {response.request.url.path}"
+        assert response.status_code == 200, response.text
+        count = query_count(response)
+        budget = QUERY_BUDGETS[endpoint]
+        assert count <= budget, f"{endpoint} ran {count} SQL statements, over its budget of {budget}"
+    return check
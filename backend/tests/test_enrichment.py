@@ -0,0 +1,51 @@
+"""Match and connection listings enrich every row from one batched query."""
+import itertools
+from app.database import SessionLocal
+from app.models.matching import ConnectionRequest, Match
+from app.models.startup import Startup
+from app.models.user import User, UserRole
+from conftest import query_count
+
+_targets = itertools.count(1)
+
+
+def _add_targets(source_user_id: int, count: int) -> None:
+    """Founders with a startup, each with a match and a connection request from the source user."""
+    with SessionLocal() as db:
+        for _ in range(count):
+            target = User(email=f"target{next(_targets)}@example.com", hashed_password="x",
+                          full_name="Target Founder", role=UserRole.FOUNDER)
+            db.add(target)
+            db.flush()
+            db.add(Startup(founder_id=target.id, name=f"Startup {target.id}", industry="fintech"))
+            match = Match(source_user_id=source_user_id, target_user_id=target.id,
+                          match_type="startup_to_investor", overall_score=0.5)
+            db.add(match)
+            db.flush()
+            db.add(ConnectionRequest(from_user_id=source_user_id, to_user_id=target.id, match_id=match.id))
+        db.commit()
+
+
+def _listing_queries(client, headers, path: str, expected_rows: int) -> int:
+    response = client.get(path, params={"limit": 500}, headers=headers)
+    assert response.status_code == 200, response.text
+    rows = response.json()
+    assert len(rows) == expected_rows
+    assert all(row.get("startup_name") or row.get("to_name") for row in rows)
+    return query_count(response)
+
+
+def test_enrichment_queries_do_not_grow_with_rows(client, register):
+    user_id, headers = register("investor")
+    # Resolve the token once, so every measured request finds the user in the auth cache
+    client.get("/api/auth/me", headers=headers)
+
+    _add_targets(user_id, 4)
+    few = [_listing_queries(client, headers, path, 4)
+           for path in ("/api/matching/results", "/api/matching/connections")]
+
+    _add_targets(user_id, 76)
+    many = [_listing_queries(client, headers, path, 80)
+            for path in ("/api/matching/results", "/api/matching/connections")]
+
+    assert few == many
@@ -0,0 +1,71 @@
+"""The hot endpoints stay within their SQL statement budgets (QUERY_BUDGETS in conftest)."""
+import pytest
+
+
+@pytest.fixture
+def founder(client, register):
+    user_id, headers = register("founder", "Budget Founder")
+    response = client.post("/api/startups", headers=headers, json={
+        "name": "Budget Labs", "industry": "fintech", "stage": "mvp",
+        "description": "Payments for small merchants in Nepal",
+    })
+    assert response.status_code == 200, response.text
+    for title, skills in [("Backend engineer", ["Python", "FastAPI", "PostgreSQL"]),
+                          ("Mobile developer", ["Flutter", "Kotlin"])]:
+        response = client.post("/api/startups/requirements", headers=headers,
+                               json={"title": title, "required_skills": skills})
+        assert response.status_code == 200, response.text
+    return headers
+
+
+@pytest.fixture
+def talent(client, register):
+    user_id, headers = register("talent", "Budget Talent")
+    response = client.post("/api/talent", headers=headers, json={
+        "institution": "Kathmandu University",
+        "skills": [{"name": "Python"}, {"name": "FastAPI"}, {"name": "Docker"}],
+    })
+    assert response.status_code == 200, response.text
+    return headers
+
+
+@pytest.fixture
+def investor(client, register):
+    user_id, headers = register("investor", "Budget Investor")
+    response = client.post("/api/investors", headers=headers, json={
+        "preferred_sectors": ["fintech"], "preferred_stages": ["mvp"],
+    })
+    assert response.status_code == 200, response.text
+    return headers
+
+
+def test_founder_endpoints(client, founder, talent, investor, query_budget):
+    for method, path in [
+        ("POST", "/api/matching/refresh"),
+        ("GET", "/api/auth/me"),
+        ("GET", "/api/startups/me"),
+        ("GET", "/api/startups"),
+        ("GET", "/api/startups/requirements"),
+        ("GET", "/api/matching/results"),
+        ("GET", "/api/matching/connections"),
+    ]:
+        query_budget(client.request(method, path, headers=founder))
+
+
+def test_talent_endpoints(client, founder, talent, query_budget):
+    for method, path in [
+        ("POST", "/api/matching/refresh"),
+        ("GET", "/api/talent/me"),
+        ("GET", "/api/startups/requirements/all"),
+        ("GET", "/api/matching/results"),
+    ]:
+        query_budget(client.request(method, path, headers=talent))
+
+
+def test_investor_endpoints(client, founder, investor, query_budget):
+    for method, path in [
+        ("POST", "/api/matching/refresh"),
+        ("GET", "/api/investors/me"),
+        ("GET", "/api/matching/results"),
+    ]:
+        query_budget(client.request(method, path, headers=investor))